@@ -14,6 +14,7 @@
 * limitations under the License.
 """
 
+from bisect import bisect_left, insort
 from collections.abc import MutableSequence
 
 from arsenalqa.base.exceptions import UniqueNotFoundError
@@ -21,10 +22,24 @@ from arsenalqa.base.utils import compare_attrs
 
 
 class ListObject(MutableSequence):
+    """
+    Parameters:
+        data(list): list of raw elements
+        wrapper(callable): default dict. Callable object for wrapping raw elements on access(usually Model._wrap)
+        cache(bool): default False. If True, wrapped elements are memoized per index, so repeated access to the same
+            element returns the same wrapped object. Memoized object is dropped, when element at its index is replaced
 
-    def __init__(self, data=None, wrapper=None):
+    Hash indexes built by index_by are used by filter_by_attrs(and so by unique_by_attrs, unique_by_model)
+    automatically. Indexes are maintained by ListObject methods, but not on direct changes of data list and not on
+    changes of elements through their models(lst[0].id = 2): such element is not found by its new values, until
+    index_by is called again
+    """
+
+    def __init__(self, data=None, wrapper=None, cache=False):
         self.data = data or []
         self.wrapper = wrapper or dict
+        self._cache = {} if cache else None
+        self._indexes = {}
 
     @staticmethod
     def unwrap(p_object):
@@ -33,9 +48,25 @@ class ListObject(MutableSequence):
     def wrap(self, elem: dict):
         return self.wrapper(elem)
 
+    def _wrap_at(self, index, elem):
+        cached = self._cache.get(index)
+        if cached is not None and cached[0] is elem:
+            return cached[1]
+        wrapped = self.wrap(elem)
+        self._cache[index] = (elem, wrapped)
+        return wrapped
+
+    def _invalidate(self):
+        if self._cache:
+            self._cache.clear()
+
     def __iter__(self):
-        for elem in self.data:
-            yield self.wrap(elem)
+        if self._cache is None:
+            for elem in self.data:
+                yield self.wrap(elem)
+        else:
+            for index, elem in enumerate(self.data):
+                yield self._wrap_at(index, elem)
 
     def __str__(self):
         return 'I:{}'.format(self.data)
@@ -44,13 +75,32 @@ class ListObject(MutableSequence):
         return self.__str__()
 
     def __getitem__(self, key):
-        return self.wrap(self.data[key])
+        elem = self.data[key]
+        if self._cache is None or not isinstance(key, int):
+            return self.wrap(elem)
+        return self._wrap_at(key if key >= 0 else key + len(self.data), elem)
 
     def __setitem__(self, key, value):
+        if self._indexes and isinstance(key, int):
+            key = self._position(key)
+            self._index_remove(key, self[key])
+            self.data[key] = self.unwrap(value)
+            self._invalidate()
+            self._index_add(key, self[key])
+            return
         self.data[key] = self.unwrap(value)
+        self._invalidate()
+        if self._indexes:
+            self._reindex()
 
     def __delitem__(self, key):
+        if self._indexes and isinstance(key, int):
+            self.pop(key)
+            return
         del self.data[key]
+        self._invalidate()
+        if self._indexes:
+            self._reindex()
 
     def __len__(self):
         return len(self.data)
@@ -66,14 +116,117 @@ class ListObject(MutableSequence):
 
     def append(self, p_object):
         self.data.append(self.unwrap(p_object))
+        if self._indexes:
+            self._index_add(len(self.data) - 1, self[-1])
+
+    def index_by(self, *attrs):
+        """Builds hash index by one or more attributes of wrapped elements. Attribute values must be hashable
+
+        Args:
+            *attrs: attribute names. Composite index is built for several names
+
+        Returns:
+            ListObject: self
+
+        >>> users = User.wrap([{'id': 1, 'name': 'Jhon'}, {'id': 2, 'name': 'Andrew'}]).index_by('id')
+        >>> users.unique_by_attrs(id=2)  # finds user by index without scanning whole list
+        M:{'id': 2, 'name': 'Andrew'}
+        """
+        if not attrs:
+            raise ValueError('At least one attribute is required for index')
+        index = self._indexes[attrs] = {}
+        for position, elem in enumerate(self):
+            index.setdefault(self._index_key(elem, attrs), []).append(position)
+        return self
+
+    def drop_index(self, *attrs):
+        self._indexes.pop(attrs, None)
+
+    def _reindex(self):
+        for attrs in list(self._indexes):
+            self.index_by(*attrs)
+
+    @staticmethod
+    def _index_key(elem, attrs):
+        return tuple(getattr(elem, attr, None) for attr in attrs)
+
+    def _index_add(self, position, elem):
+        for attrs, index in self._indexes.items():
+            insort(index.setdefault(self._index_key(elem, attrs), []), position)
+
+    def _index_remove(self, position, elem):
+        for attrs, index in self._indexes.items():
+            key = self._index_key(elem, attrs)
+            positions = index.get(key, ())
+            i = bisect_left(positions, position)
+            if i == len(positions) or positions[i] != position:
+                # element was changed after indexing, its position is stored under the old key
+                key, positions = next((k, j) for k, j in index.items() if position in j)
+                i = bisect_left(positions, position)
+            del positions[i]
+            if not positions:
+                del index[key]
+
+    def _index_shift(self, start, delta):
+        for index in self._indexes.values():
+            for positions in index.values():
+                for i in range(bisect_left(positions, start), len(positions)):
+                    positions[i] += delta
+
+    def _position(self, index):
+        length = len(self.data)
+        if not -length <= index < length:
+            raise IndexError('list index out of range')
+        return index if index >= 0 else index + length
+
+    def _lookup(self, attrs):
+        """Returns positions of elements found by the best index and attrs for their check or None without index.
+        Found elements are checked by all attrs, because element could be changed after indexing"""
+        covering = [i for i in self._indexes if attrs.keys() >= frozenset(i)]
+        if not covering:
+            return None
+        index_attrs = max(covering, key=len)
+        try:
+            positions = self._indexes[index_attrs].get(tuple(attrs[i] for i in index_attrs), ())
+        except TypeError:
+            return None
+        return positions, attrs
 
     def filter_by_attrs(self, **attrs):
-        result = type(self)(wrapper=self.wrapper)
+        result = type(self)(wrapper=self.wrapper, cache=self._cache is not None)
+        lookup = self._lookup(attrs) if self._indexes else None
+        if lookup is not None:
+            positions, attrs = lookup
+            for position in positions:
+                i = self[position]
+                if compare_attrs(i, **attrs):
+                    result.append(i)
+            return result
+        keys = self._raw_keys(attrs)
+        if keys is not None:
+            raw_attrs = [(keys[i], j) for i, j in attrs.items()]
+            for elem in self.data:
+                if type(elem) is dict:
+                    for key, value in raw_attrs:
+                        if elem.get(key) != value:
+                            break
+                    else:
+                        result.append(elem)
+                elif compare_attrs(self.wrap(elem), **attrs):
+                    result.append(elem)
+            return result
         for i in self:
             if compare_attrs(i, **attrs):
                 result.append(i)
         return result
 
+    def _raw_keys(self, attrs):
+        """Returns data keys for attrs, if elements can be filtered without wrapping(see Model.get_raw_keys)"""
+        get_raw_keys = getattr(getattr(self.wrapper, '__self__', None), 'get_raw_keys', None)
+        if get_raw_keys is None:
+            return None
+        return get_raw_keys(self.wrapper, attrs)
+
     def unique_by_attrs(self, **attrs):
         result = self.filter_by_attrs(**attrs)
         if len(result) == 1:
@@ -83,6 +236,15 @@ class ListObject(MutableSequence):
     def unique_by_model(self, model):
         return self.unique_by_attrs(**model.model_filter())
 
+    def to_columns(self):
+        """Converts list of dicts to ColumnarListObject. Requires arsenalqa[columnar] extra(numpy)
+
+        Returns:
+            ColumnarListObject
+        """
+        from arsenalqa.columnar import ColumnarListObject
+        return ColumnarListObject.from_list(self)
+
     def get_attrs(self, *attrs):
         return [[getattr(i, j) for j in attrs] for i in self]
 
@@ -90,10 +252,25 @@ class ListObject(MutableSequence):
         return [getattr(i, attr) for i in self]
 
     def pop(self, i=-1):
-        return self.data.pop(i)
+        if self._indexes:
+            i = self._position(i)
+            self._index_remove(i, self[i])
+            self._index_shift(i + 1, -1)
+        elem = self.data.pop(i)
+        self._invalidate()
+        return elem
 
     def extend(self, listobject):
+        start = len(self.data)
         self.data.extend([self.unwrap(i) for i in getattr(listobject, 'data', listobject)])
+        if self._indexes:
+            for position in range(start, len(self.data)):
+                self._index_add(position, self[position])
 
     def insert(self, index, object) -> None:
-        self.data.insert(index, getattr(object, 'data', object))
\ No newline at end of file
+        self.data.insert(index, getattr(object, 'data', object))
+        self._invalidate()
+        if self._indexes:
+            position = min(max(index + len(self.data) - 1 if index < 0 else index, 0), len(self.data) - 1)
+            self._index_shift(position, 1)
+            self._index_add(position, self[position])
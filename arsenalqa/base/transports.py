@@ -14,10 +14,81 @@
 * limitations under the License.
 """
 
+from functools import lru_cache
+from string import Formatter
 from urllib.parse import urljoin, urlparse
 
-from arsenalqa.base.utils import SafeFormatDict
-from arsenalqa.models import Model
+from arsenalqa.base.utils import Dummy, SafeFormatDict
+from arsenalqa.models import BaseModel, Model
+
+
+@lru_cache(maxsize=256)
+def compile_url(host, url):
+    """Joins host and url once and extracts placeholder names from result template.
+    Names are None if template has placeholders which can not be resolved by name only:
+    positional, attribute/index access, conversion or format spec
+
+    Parameters:
+        host(str): base url
+        url(str): url template
+
+    Returns:
+        tuple(template, names)
+
+    >>> print(compile_url('http://host', '/users/{id}/{name}'))
+    ('http://host/users/{id}/{name}', ('id', 'name'))
+    """
+    template = urljoin(host, url)
+    names = []
+    for _, name, spec, conversion in Formatter().parse(template):
+        if name is None:
+            continue
+        if spec or conversion or not name.isidentifier():
+            return template, None
+        names.append(name)
+    return template, tuple(dict.fromkeys(names))
+
+
+def normalize_url(url):
+    parsed = urlparse(url)
+    if not parsed.netloc and url.startswith(parsed.scheme + '://'):
+        # urls without host(memory://, sqlite:////tmp/db) are returned as is: unparsing drops "//" after scheme
+        return url
+    url = parsed._replace(path=parsed.path.replace('//', '/'))
+    return url.geturl()
+
+
+@lru_cache(maxsize=4096)
+def resolve_url(template, names, values):
+    """Formats compiled template and normalizes double slashes in path. Results are cached
+
+    Parameters:
+        template(str): template from compile_url
+        names(tuple): placeholder names
+        values(tuple): formatted placeholder values
+
+    Returns:
+        str
+    """
+    return normalize_url(template.format_map(dict(zip(names, values))))
+
+
+def url_values(model, names):
+    """Returns formatted values of model for placeholder names. Missing values are empty strings
+
+    Parameters:
+        model: model instance, dict or anything SafeFormatDict accepts
+        names(tuple): placeholder names
+
+    Returns:
+        tuple
+    """
+    if isinstance(model, BaseModel):
+        fields = model._fields
+        values = (getattr(model, name, Dummy) if name in fields else Dummy for name in names)
+        return tuple('' if value is Dummy else format(value) for value in values)
+    data = SafeFormatDict(model)
+    return tuple(format(data[name]) for name in names)
 
 
 class FakeModel(Model):
@@ -42,10 +113,8 @@ class BaseTransport:
         self.serializer = serializer
 
     def prepare_url(self, host=None, url=None):
-        host = host or self.host
-        url = url or self.url
-        url = urljoin(host, url)
-        url = urlparse(url.format_map(SafeFormatDict(self.model)))
-        url = url._replace(path=url.path.replace('//', '/'))
-        return url.geturl()
+        template, names = compile_url(host or self.host, url or self.url)
+        if names is None:
+            return normalize_url(template.format_map(SafeFormatDict(self.model)))
+        return resolve_url(template, names, url_values(self.model, names))
 
@@ -0,0 +1,192 @@
+"""
+* Copyright 2020 Wargaming Group Limited
+*
+* Licensed under the Apache License, Version 2.0 (the "License");
+* you may not use this file except in compliance with the License.
+* You may obtain a copy of the License at
+*
+*     http://www.apache.org/licenses/LICENSE-2.0
+*
+* Unless required by applicable law or agreed to in writing, software
+* distributed under the License is distributed on an "AS IS" BASIS,
+* WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+* See the License for the specific language governing permissions and
+* limitations under the License.
+"""
+
+from collections.abc import Sequence
+
+import numpy
+
+from arsenalqa.base.exceptions import UniqueNotFoundError
+from arsenalqa.base.iterables import ListObject
+from arsenalqa.base.utils import compare_attrs
+
+
+def to_column(values):
+    """Converts list of python values to numpy array. Typed array is used if all values are bool, int, float or str,
+    otherwise(e.g. ints mixed with floats) values are kept as python objects, so rows are restored unchanged
+    """
+    kinds = set(map(type, values))
+    dtype = object
+    if kinds and kinds <= {bool}:
+        dtype = bool
+    elif kinds and kinds <= {int}:
+        dtype = numpy.int64
+    elif kinds and kinds <= {float}:
+        dtype = numpy.float64
+    elif kinds and kinds <= {str}:
+        dtype = numpy.str_
+    if dtype is not object:
+        try:
+            return numpy.array(values, dtype=dtype)
+        except OverflowError:
+            pass
+    column = numpy.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        column[i] = value
+    return column
+
+
+class ColumnarListObject(Sequence):
+    """
+    Columnar representation of ListObject of dicts. Every data key is stored as numpy array, so attributes of plain
+    fields are extracted and filtered without wrapping of rows. Rows are assembled back to dicts and wrapped on access.
+
+    Parameters:
+        columns(dict): data key - numpy array of values. Values of missing keys are None
+        present(dict): data key - numpy bool array, which marks rows having this key
+        length(int): rows count
+        wrapper(callable): default dict. Callable object for wrapping rows(usually Model._wrap)
+
+    >>> posts = Post.wrap(rows).to_columns()
+    >>> posts.get_attr('user_id').mean()
+    >>> posts.filter_by_attrs(user_id=1).to_list()
+    """
+
+    def __init__(self, columns=None, present=None, length=0, wrapper=None):
+        self.columns = columns or {}
+        self.present = present or {}
+        self.length = length
+        self.wrapper = wrapper or dict
+
+    @classmethod
+    def from_list(cls, listobject, wrapper=None):
+        """Creates columnar object from ListObject or list of dicts
+
+        Args:
+            listobject(Union[ListObject, list]): rows
+            wrapper(callable): optional. Default listobject.wrapper
+
+        Returns:
+            ColumnarListObject
+        """
+        wrapper = wrapper or getattr(listobject, 'wrapper', None)
+        rows = getattr(listobject, 'data', listobject)
+        for row in rows:
+            if not isinstance(row, dict):
+                raise TypeError('Only list of dicts can be converted to columns, not: {}'.format(row))
+        columns, present = {}, {}
+        for key in dict.fromkeys(key for row in rows for key in row):
+            columns[key] = to_column([row.get(key) for row in rows])
+            present[key] = numpy.array([key in row for row in rows], dtype=bool)
+        return cls(columns=columns, present=present, length=len(rows), wrapper=wrapper)
+
+    def row(self, index):
+        """Returns raw dict of row"""
+        row = {}
+        for key, column in self.columns.items():
+            if self.present[key][index]:
+                value = column[index]
+                row[key] = value.item() if column.dtype != object else value
+        return row
+
+    def wrap(self, elem: dict):
+        return self.wrapper(elem)
+
+    def take(self, mask):
+        """Returns new columnar object with rows selected by numpy bool mask or array of indexes"""
+        return type(self)(
+            columns={key: column[mask] for key, column in self.columns.items()},
+            present={key: present[mask] for key, present in self.present.items()},
+            length=len(numpy.arange(self.length)[mask]),
+            wrapper=self.wrapper,
+        )
+
+    def to_list(self):
+        """Converts columns back to ListObject of dicts"""
+        return ListObject(data=[self.row(i) for i in range(self.length)], wrapper=self.wrapper)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.take(key)
+        if not -self.length <= key < self.length:
+            raise IndexError('list index out of range')
+        return self.wrap(self.row(key % self.length))
+
+    def __iter__(self):
+        for i in range(self.length):
+            yield self.wrap(self.row(i))
+
+    def __len__(self):
+        return self.length
+
+    def __bool__(self):
+        return bool(self.length)
+
+    def __str__(self):
+        return 'C:{}'.format(self.columns)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def _raw_key(self, attr):
+        """Returns data key of attr, if attr values are stored in column as is. Otherwise returns None"""
+        get_raw_keys = getattr(getattr(self.wrapper, '__self__', None), 'get_raw_keys', None)
+        if get_raw_keys is None:
+            return attr if self.wrapper is dict else None
+        keys = get_raw_keys(self.wrapper, [attr])
+        return keys and keys[attr]
+
+    def _column(self, key):
+        if key in self.columns:
+            return self.columns[key], self.present[key]
+        return numpy.full(self.length, None, dtype=object), numpy.zeros(self.length, dtype=bool)
+
+    def get_attr(self, attr):
+        """Returns numpy array of attribute values. Values of rows without attribute are None"""
+        key = self._raw_key(attr)
+        if key is not None:
+            return self._column(key)[0]
+        return to_column([getattr(i, attr, None) for i in self])
+
+    def get_attrs(self, *attrs):
+        """Returns list of numpy arrays: one array per attribute"""
+        return [self.get_attr(attr) for attr in attrs]
+
+    def _mask(self, attr, value):
+        key = self._raw_key(attr)
+        if key is None or isinstance(value, (list, tuple, dict, set, numpy.ndarray)):
+            return numpy.array([compare_attrs(i, **{attr: value}) for i in self], dtype=bool)
+        column, present = self._column(key)
+        if value is None:
+            return ~present | numpy.array([i is None for i in column], dtype=bool)
+        mask = numpy.asarray(column == value)
+        if mask.shape != column.shape:
+            mask = numpy.full(self.length, bool(mask))
+        return mask.astype(bool) & present
+
+    def filter_by_attrs(self, **attrs):
+        mask = numpy.ones(self.length, dtype=bool)
+        for attr, value in attrs.items():
+            mask &= self._mask(attr, value)
+        return self.take(mask)
+
+    def unique_by_attrs(self, **attrs):
+        result = self.filter_by_attrs(**attrs)
+        if len(result) == 1:
+            return result[0]
+        raise UniqueNotFoundError(self, attrs, result)
+
+    def unique_by_model(self, model):
+        return self.unique_by_attrs(**model.model_filter())
@@ -53,17 +53,71 @@ class Field(BaseField):
     def __delete__(self, instance):
         del instance.data[self.name]
 
+    @property
+    def plain(self):
+        """True if field reads value from dict data as is, without transformations"""
+        cls = type(self)
+        return cls.__get__ is Field.__get__ and cls.wrap is BaseField.wrap
+
+    def compile(self):
+        """Returns fast accessor for compiled models or None, if field overrides Field descriptor methods"""
+        cls = type(self)
+        if cls.__get__ is not Field.__get__ or cls.__set__ is not Field.__set__:
+            return None
+        return CompiledField(self)
+
+
+class CompiledField:
+    """
+    Accessor which replaces Field in compiled models. Reads and writes model data directly and calls wrap/unwrap
+    only if field overrides them. All corner cases(missing key, empty data, access from class) are delegated to
+    original field.
+
+    Parameters:
+        field(Field): original field
+    """
+
+    __slots__ = ('field', 'name', 'filter_field', 'wrap', 'unwrap')
+
+    def __init__(self, field):
+        self.field = field
+        self.name = field.name
+        self.filter_field = field.filter_field
+        cls = type(field)
+        self.wrap = field.wrap if cls.wrap is not BaseField.wrap else None
+        self.unwrap = field.unwrap if cls.unwrap is not BaseField.unwrap else None
+
+    def __get__(self, instance, owner):
+        try:
+            value = instance._data[self.name]
+        except (AttributeError, KeyError, TypeError):
+            return self.field.__get__(instance, owner)
+        if value is None or self.wrap is None:
+            return value
+        return self.wrap(instance, owner, value)
+
+    def __set__(self, instance, value):
+        if value is not None and self.unwrap is not None:
+            value = self.unwrap(instance, value)
+        instance.data[self.name] = value
+
+    def __delete__(self, instance):
+        del instance.data[self.name]
+
 
 class ModelField(Field):
     """
     Parameters:
         model(Model): type for wrap subdict from dict data. If None - wraps subdict in current model
+        cache(bool): default False. If True, wrapped subdict is memoized in model instance until subdict is replaced,
+            so repeated reads of the field return the same object
         **kwarg: Field parameters
     """
 
-    def __init__(self, model=None, **kwargs):
+    def __init__(self, model=None, cache=False, **kwargs):
         super(ModelField, self).__init__(**kwargs)
         self.model = model
+        self.cache = cache
 
     def chose_wrapper(self, owner):
         return self.model or owner
@@ -72,6 +126,19 @@ class ModelField(Field):
         return getattr(value, 'data', value)
 
     def wrap(self, instance, owner, value):
+        if not self.cache:
+            return self.wrap_value(owner, value)
+        cache = getattr(instance, '_wrapped', None)
+        if cache is None:
+            cache = instance._wrapped = {}
+        cached = cache.get(self)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        wrapped = self.wrap_value(owner, value)
+        cache[self] = (value, wrapped)
+        return wrapped
+
+    def wrap_value(self, owner, value):
         return self.chose_wrapper(owner).wrap(value)
 
 
@@ -85,8 +152,8 @@ class ListModelField(ModelField):
             return [super(ListModelField, self).unwrap(instance, i) for i in value]
         return getattr(value, 'data', value)
 
-    def wrap(self, instance, owner, value):
-        return ListObject(data=value, wrapper=self.chose_wrapper(owner).wrap)
+    def wrap_value(self, owner, value):
+        return ListObject(data=value, wrapper=self.chose_wrapper(owner).wrap, cache=self.cache)
 
 
 class DateTimeField(Field):
@@ -14,6 +14,7 @@
 * limitations under the License.
 """
 
+from abc import ABCMeta
 from collections.abc import MutableMapping
 
 from arsenalqa.base.iterables import ListObject
@@ -34,11 +35,44 @@ class DataDescriptor:
         setattr(instance, '_data', value)
 
 
-class Model(MutableMapping):
+class BaseModel(MutableMapping):
+    """
+    Common behavior of models. Use Model or SlottedModel as parent of your models
+    """
+
+    __slots__ = ()
 
     data = DataDescriptor()
     _filter_fields = frozenset()
     _fields = frozenset()
+    _field_keys = ()
+    _compiled = False
+
+    def __init_subclass__(cls, compiled=None, **kwargs):
+        """
+        Parameters:
+            compiled(bool): optional. If True, fields of model and its subclasses are replaced by fast accessors.
+                By default value is inherited from parent model
+
+        >>> class MyModel(Model, compiled=True):
+        >>>     id = Field()
+        """
+        super(BaseModel, cls).__init_subclass__(**kwargs)
+        if compiled is not None:
+            cls._compiled = compiled
+        if cls._compiled:
+            cls._compile()
+
+    @classmethod
+    def _compile(cls):
+        for name in cls._fields:
+            field = cls.__dict__.get(name)
+            compile_field = getattr(field, 'compile', None)
+            if compile_field is not None:
+                accessor = compile_field()
+                if accessor is not None:
+                    setattr(cls, name, accessor)
+        cls._field_keys = tuple((name, cls.get_field_key(name)) for name in cls._fields)
 
     def __init__(self, **kwargs):
         """
@@ -139,7 +173,55 @@ class Model(MutableMapping):
         >>> print(MyModel.get_field_key('id'))
         name+id
         """
-        return cls.__dict__[field].name
+        return cls.get_field(field).name
+
+    @classmethod
+    def get_field(cls, field):
+        """ Returns field instance by attribute name. Searches field in parent models too
+
+        >>> class MyModel(Model):
+        >>>     id = Field(name='name+id')
+        >>>
+        >>> print(MyModel.get_field('id').name)
+        name+id
+        """
+        for klass in cls.__mro__:
+            if field in klass.__dict__:
+                field = klass.__dict__[field]
+                return getattr(field, 'field', field)
+        raise KeyError(field)
+
+    @classmethod
+    def get_raw_keys(cls, wrapper, fields):
+        """ Returns dict data keys for fields, if values of these fields can be read from raw data directly: wrapper
+        is untouched wrap or _wrap method of model and all fields are plain Field. Otherwise returns None
+
+        >>> class MyModel(Model):
+        >>>     id = Field(name='not_id')
+        >>>     date = DateTimeField()
+        >>>
+        >>> print(MyModel.get_raw_keys(MyModel._wrap, ['id']))
+        {'id': 'not_id'}
+        >>> print(MyModel.get_raw_keys(MyModel._wrap, ['id', 'date']))
+        None
+        """
+        func = getattr(wrapper, '__func__', None)
+        if func is not BaseModel._wrap.__func__ and not (
+                func is BaseModel.wrap.__func__
+                and cls._wrap.__func__ is BaseModel._wrap.__func__
+                and cls.transform_incoming_data.__func__ is BaseModel.transform_incoming_data.__func__
+        ):
+            return None
+        keys = {}
+        for name in fields:
+            try:
+                field = cls.get_field(name)
+            except KeyError:
+                return None
+            if not getattr(field, 'plain', False):
+                return None
+            keys[name] = field.name
+        return keys
 
     def model_filter(self):
         """
@@ -192,6 +274,12 @@ class Model(MutableMapping):
         return len(self.data)
 
     def __iter__(self):
+        if self._compiled and isinstance(self.data, dict):
+            data = self.data
+            for elem, key in self._field_keys:
+                if key in data:
+                    yield elem
+            return
         for elem in self._fields:
             if getattr(self, elem, Dummy) != Dummy:
                 yield elem
@@ -212,3 +300,33 @@ class Model(MutableMapping):
             delattr(self, key)
         except AttributeError:
             raise KeyError(f'Model: {self.__class__.__name__} has no Field: {key}')
+
+
+class Model(BaseModel):
+    """
+    Default model. Instances store data and linked transports in instance __dict__
+    """
+
+
+class SlottedModelMeta(ABCMeta):
+    """
+    Adds empty __slots__ to every SlottedModel subclass, which doesn't declare them, so subclasses never get __dict__
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        namespace.setdefault('__slots__', ())
+        return super(SlottedModelMeta, mcs).__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class SlottedModel(BaseModel, metaclass=SlottedModelMeta):
+    """
+    Compact model for keeping lots of instances in memory. Instances have no __dict__: data, transports linked by
+    TransportManager and values memoized by fields are stored in slots. Arbitrary instance attributes can't be set.
+
+    >>> class MyModel(SlottedModel):
+    >>>     id = Field()
+    >>>
+    >>> rows = MyModel.wrap([{'id': 1}, {'id': 2}])
+    """
+
+    __slots__ = ('_data', '_transports', '_wrapped')
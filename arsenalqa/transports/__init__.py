@@ -14,36 +14,169 @@
 * limitations under the License.
 """
 
+import codecs
 import importlib
+from json import JSONDecodeError, JSONDecoder
 
 
 RAW = 'raw'
 
+WHITESPACE = ' \t\n\r'
+
+
+def iter_json_array(chunks, encoding='utf-8'):
+    """Incrementally parses top-level JSON array from chunks and yields its elements one by one.
+    Only unparsed tail of data is kept in memory
+
+    Parameters:
+        chunks(Iterable): bytes or str chunks of JSON array(e.g. requests.Response.iter_content)
+        encoding(str): default "utf-8". Encoding of bytes chunks
+
+    Returns:
+        generator of parsed elements
+
+    >>> print(list(iter_json_array([b'[{"id": 1}, {"i', b'd": 2}]'])))
+    [{'id': 1}, {'id': 2}]
+    """
+    decoder = JSONDecoder()
+    decode = codecs.getincrementaldecoder(encoding)().decode
+    chunks = iter(chunks)
+    buffer, position, eof = '', 0, False
+    expected = '['
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+        more = position == len(buffer)
+        if not more:
+            char = buffer[position]
+            if expected == '[':
+                if char != '[':
+                    raise JSONDecodeError('Expecting top-level array', buffer, position)
+                position, expected = position + 1, 'first'
+            elif expected == ',':
+                if char == ']':
+                    return
+                if char != ',':
+                    raise JSONDecodeError("Expecting ',' delimiter", buffer, position)
+                position, expected = position + 1, 'value'
+            elif char == ']' and expected == 'first':
+                return
+            else:
+                try:
+                    element, end = decoder.raw_decode(buffer, position)
+                except JSONDecodeError:
+                    if eof:
+                        raise
+                    more = True
+                else:
+                    # number cut by chunk boundary is parsed partially, so element is complete only if
+                    # it is followed by delimiter in buffer
+                    delimiter = end
+                    while delimiter < len(buffer) and buffer[delimiter] in WHITESPACE:
+                        delimiter += 1
+                    more = not eof and (delimiter == len(buffer) or buffer[delimiter] not in ',]')
+                    if not more:
+                        yield element
+                        position, expected = end, ','
+        if more:
+            if eof:
+                raise JSONDecodeError('Unterminated array', buffer, position)
+            chunk = next(chunks, None)
+            eof = chunk is None
+            if not isinstance(chunk, str):
+                chunk = decode(chunk or b'', final=eof)
+            buffer, position = buffer[position:] + chunk, 0
+
+
+class Codec:
+    """Serialization format: dumps and loads functions of module with media type of serialized data
+
+    Parameters:
+        name(str): codec name
+        module: module or object with two methods: dumps and loads
+        content_type(str): optional. Media type of serialized data. Http sets it to Content-Type header
+        binary(bool): True if dumps returns bytes, False if str
+    """
+
+    def __init__(self, name, module, content_type=None, binary=False):
+        self.name = name
+        self.module = module
+        self.content_type = content_type
+        self.binary = binary
+        self.dumps = module.dumps
+        self.loads = module.loads
+
+    def __repr__(self):
+        return 'Codec({!r}, content_type={!r})'.format(self.name, self.content_type)
+
 
 class Serializer:
+    """Registry of codecs. Names are case-insensitive.
+
+    Known codecs("json", "orjson", "ujson", "msgpack") are imported on first use. orjson and msgpack return bytes,
+    so data is sent without str conversion. Any other module with dumps and loads methods can be used by its name
+
+    >>> Serializer.dumps({'id': 1}, serializer='orjson')
+    b'{"id":1}'
+    >>> Serializer.content_type('MSGPACK')
+    application/msgpack
+    """
     registered = {}
+    known = {
+        'json': ('json', 'application/json', False),
+        'orjson': ('orjson', 'application/json', True),
+        'ujson': ('ujson', 'application/json', False),
+        'msgpack': ('msgpack', 'application/msgpack', True),
+    }
 
     @classmethod
-    def register(cls, name):
-        if isinstance(name, str):
-            module = importlib.import_module(name)
-        else:
-            module = name
-        cls.registered[name] = module
-        return module
+    def register(cls, name, module=None, content_type=None, binary=False):
+        """Registers codec
+
+        Parameters:
+            name(str): codec name. Name of module if module is None
+            module: optional. Module or object with two methods: dumps and loads
+            content_type(str): optional. Media type of serialized data
+            binary(bool): True if dumps returns bytes
+
+        Returns:
+            Codec
+
+        >>> Serializer.register('yaml', MyYaml, content_type='application/yaml')
+        """
+        key = name.lower() if isinstance(name, str) else name
+        if module is None:
+            if isinstance(name, str):
+                module_name, content_type, binary = cls.known.get(key, (name, content_type, binary))
+                module = importlib.import_module(module_name)
+            else:
+                module = name
+        codec = module if isinstance(module, Codec) else Codec(key, module, content_type, binary)
+        cls.registered[key] = codec
+        return codec
 
     @classmethod
     def get_serializer(cls, name):
-        return cls.registered.get(name) or cls.register(name)
+        codec = cls.registered.get(name)
+        if codec is None:
+            key = name.lower() if isinstance(name, str) else name
+            codec = cls.registered.get(key) or cls.register(name)
+        return codec
+
+    @classmethod
+    def content_type(cls, serializer=RAW):
+        if isinstance(serializer, str) and serializer.lower() == RAW:
+            return None
+        return cls.get_serializer(serializer).content_type
 
     @classmethod
     def dumps(cls, target, serializer=RAW, **kwargs):
-        if serializer.lower() == RAW:
+        if isinstance(serializer, str) and serializer.lower() == RAW:
             return target
         return cls.get_serializer(serializer).dumps(target, **kwargs)
 
     @classmethod
     def loads(cls, target, serializer=RAW, **kwargs):
-        if serializer.lower() == RAW:
+        if isinstance(serializer, str) and serializer.lower() == RAW:
             return target
         return cls.get_serializer(serializer).loads(target, **kwargs)
@@ -14,7 +14,14 @@
 * limitations under the License.
 """
 
-from kombu import Connection, Queue, Producer
+import socket
+from itertools import islice
+from threading import local
+from time import monotonic, perf_counter
+
+from amqp import spec
+from kombu import Connection, Consumer, Queue, Producer
+from kombu.serialization import dumps
 from waiter import wait as waiter
 
 from arsenalqa.base.utils import compare_attrs
@@ -22,6 +29,99 @@ from arsenalqa.base.iterables import ListObject
 from arsenalqa.base.transports import BaseTransport
 
 
+class SingleConnection:
+    """
+    Creates one kombu Connection per url, connection parameters and thread(kombu connections and channels are not
+    thread-safe). Connection is established on first use and stays open, so all transports of one broker in thread
+    reuse the same connection, default channel and producer
+
+    Parameters:
+        url(str): amqp url
+        **kwargs: kombu.Connection parameters, e.g. heartbeat, transport_options
+    """
+
+    scoped = local()
+
+    def __new__(cls, url, **kwargs):
+        connections = cls._scoped('connections')
+        key = (url, repr(sorted(kwargs.items())))
+        session = connections.get(key)
+        if session is None:
+            session = connections[key] = Connection(url, **kwargs)
+        return session
+
+    @classmethod
+    def producer(cls, session):
+        """Returns producer on default channel of connection. Producer is created once per connection"""
+        producers = cls._scoped('producers')
+        producer = producers.get(session)
+        channel = session.default_channel
+        if producer is None:
+            producer = producers[session] = Producer(channel)
+        elif producer.channel is not channel:
+            producer.revive(channel)
+        return producer
+
+    @classmethod
+    def release(cls):
+        """Closes all connections of current thread"""
+        cls._scoped('producers').clear()
+        connections = cls._scoped('connections')
+        for session in connections.values():
+            session.release()
+        connections.clear()
+
+    @classmethod
+    def _scoped(cls, name):
+        scoped = getattr(cls.scoped, name, None)
+        if scoped is None:
+            scoped = {}
+            setattr(cls.scoped, name, scoped)
+        return scoped
+
+
+class PublisherConfirms:
+    """
+    Publisher confirms(RabbitMQ extension) of channel. Channel is switched to confirm mode, messages are published
+    without waiting, confirmations are awaited for batch of messages at once
+
+    Parameters:
+        channel(amqp.Channel): channel of py-amqp transport
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.published = 0
+        self.unconfirmed = set()
+        self.nacked = 0
+        channel.confirm_select()
+        channel.events['basic_ack'].add(self.on_ack)
+        channel.events['basic_nack'].add(self.on_nack)
+
+    def add(self):
+        """Registers published message. Delivery tags of channel in confirm mode are counted from 1"""
+        self.published += 1
+        self.unconfirmed.add(self.published)
+
+    def on_ack(self, delivery_tag, multiple):
+        if multiple:
+            self.unconfirmed = {i for i in self.unconfirmed if i > delivery_tag}
+        else:
+            self.unconfirmed.discard(delivery_tag)
+
+    def on_nack(self, delivery_tag, multiple):
+        count = len(self.unconfirmed)
+        self.on_ack(delivery_tag, multiple)
+        self.nacked += count - len(self.unconfirmed)
+
+    def wait(self, timeout=None):
+        """Waits confirmations of all published messages. Raises Exception if broker rejected some of them"""
+        while self.unconfirmed:
+            self.channel.wait([spec.Basic.Ack, spec.Basic.Nack], timeout=timeout)
+        if self.nacked:
+            raise Exception('{} of {} messages were not confirmed by broker'.format(self.nacked, self.published))
+
+
 class Amqp(BaseTransport):
     """
     Parameters:
@@ -32,14 +132,37 @@ class Amqp(BaseTransport):
         queue(str): amqp queue name. Used for queue declaration and getting messages.
         session(kombu.Connection): optional. Instance of kombu Connection object
         model(Model): default FakeModel. Model which will be used in transport for send data and wrap response by default
+        connection_kwargs(dict): optional. kombu.Connection parameters. Used if session parameter is None only
+        consume(bool): default False. Default mode of "all" method: if True messages are pushed by broker to consumer,
+            otherwise queue is polled
+
+    Connection is kept open between calls(see SingleConnection): all operations use its default channel and
+    one producer. If connection is lost, it is re-established and operation is retried(max_retries times)
     """
-    
-    def __init__(self, host=None, url=None, exchange=None, routing_key=None, queue=None, session=None, **kwargs):
+
+    max_retries = 3
+
+    def __init__(self, host=None, url=None, exchange=None, routing_key=None, queue=None, session=None,
+                 connection_kwargs=None, consume=False, **kwargs):
         super(Amqp, self).__init__(host=host, url=url, **kwargs)
+        self.consume = consume
         self.exchange = exchange
         self.routing_key = routing_key
         self.queue = queue
-        self.session = session or Connection(self.prepare_url(host=host, url=url))
+        self.session = session or SingleConnection(self.prepare_url(host=host, url=url), **(connection_kwargs or {}))
+
+    def ensure(self, obj, fun, *args, **kwargs):
+        """Calls fun with arguments. On connection errors connection is re-established, obj(Producer, Queue) is
+        bound to new channel and fun is called again
+
+        Returns:
+            result of fun
+        """
+        return self.session.ensure(obj, fun, max_retries=self.max_retries)(*args, **kwargs)
+
+    def bind_queue(self, name, **kwargs):
+        """Returns kombu.Queue bound to default channel of connection"""
+        return Queue(name=name, channel=self.session.default_channel, **kwargs)
 
     def choose_arg(self, **kwargs):
         return [j if j is not None else getattr(self, i, None) for i, j in kwargs.items()]
@@ -57,15 +180,8 @@ class Amqp(BaseTransport):
             queue name
         """
         queue, exchange, routing_key = self.choose_arg(queue=queue, exchange=exchange, routing_key=routing_key)
-        with self.session as session:
-            name = Queue(
-                channel=session,
-                name=queue,
-                exchange=exchange,
-                routing_key=routing_key,
-                **kwargs
-            ).declare()
-        return name
+        queue = self.bind_queue(queue, exchange=exchange, routing_key=routing_key, **kwargs)
+        return self.ensure(queue, queue.declare)
 
     def publish(self, message=None, exchange=None, routing_key=None,  **kwargs):
         """Method for message publishing. All arguments are optional.
@@ -77,10 +193,69 @@ class Amqp(BaseTransport):
             **kwargs: kombu.Producer.publish parameters
         """
         exchange, routing_key = self.choose_arg(exchange=exchange, routing_key=routing_key)
-        with self.session as session:
-            return Producer(channel=session).publish(
-                body=self.chose_data(message), exchange=exchange, routing_key=routing_key, **kwargs
-            )
+        producer = SingleConnection.producer(self.session)
+        return self.ensure(
+            producer, producer.publish,
+            body=self.chose_data(message), exchange=exchange, routing_key=routing_key, **kwargs
+        )
+
+    def publish_many(self, messages, batch_size=1000, confirm=True, confirm_timeout=None, exchange=None,
+                     routing_key=None, serializer=None, **kwargs):
+        """Publishes messages by batches on one channel. Every message is serialized once. If confirm is True and
+        transport supports publisher confirms(py-amqp), broker confirmations are awaited after every batch, not after
+        every message. Failed batches are not retried
+
+        Parameters:
+            messages(Iterable): ListObject of models, list of models or python data(dict, list, etc.)
+            batch_size(int): default 1000. Count of messages between waiting of confirmations
+            confirm(bool): default True. Wait publisher confirms if transport supports them
+            confirm_timeout(float): optional. Timeout of waiting confirmations of one batch
+            exchange(str): optional. Parameter for overriding self.exchange
+            routing_key(str): optional. Parameter for overriding self.routing_key
+            serializer(str): optional. kombu serializer name, default is serializer of producer(json)
+            **kwargs: kombu.Producer.publish parameters
+
+        Returns:
+            dict: messages and batches count, seconds and rate(messages per second)
+
+        >>> print(Event.amqp.publish_many(Event.wrap([{'id': i} for i in range(10000)]), batch_size=500))
+        {'messages': 10000, 'batches': 20, 'seconds': 0.41, 'rate': 24390.2, 'confirmed': True}
+        """
+        exchange, routing_key = self.choose_arg(exchange=exchange, routing_key=routing_key)
+        channel = self.session.channel()
+        start = perf_counter()
+        count = batches = 0
+        try:
+            confirms = PublisherConfirms(channel) if confirm and hasattr(channel, 'confirm_select') else None
+            producer = Producer(channel)
+            serializer = serializer or producer.serializer
+            messages = iter(messages)
+            while True:
+                batch = list(islice(messages, batch_size))
+                if not batch:
+                    break
+                for message in batch:
+                    content_type, content_encoding, body = dumps(self.chose_data(message), serializer=serializer)
+                    producer.publish(
+                        body=body, content_type=content_type, content_encoding=content_encoding,
+                        exchange=exchange, routing_key=routing_key, **kwargs
+                    )
+                    if confirms is not None:
+                        confirms.add()
+                if confirms is not None:
+                    confirms.wait(timeout=confirm_timeout)
+                count += len(batch)
+                batches += 1
+        finally:
+            channel.close()
+        seconds = perf_counter() - start
+        return {
+            'messages': count,
+            'batches': batches,
+            'seconds': seconds,
+            'rate': count / seconds if seconds else 0.0,
+            'confirmed': confirms is not None,
+        }
 
     def get(self, **kwargs):
         """Method for getting single filtered message. Raises Exception if messages count != 1. By default this method filters
@@ -101,22 +276,28 @@ class Amqp(BaseTransport):
             raise Exception('Messages count for get method != 1: {}'.format(result))
         return result[0]
 
-    def all(self, timeout=3, **kwargs):
+    def all(self, timeout=3, consume=None, **kwargs):
         """Method for getting list of filtered messages. By default this method filters message from queue by "filter_kwargs"
 
         Parameters:
             timeout(int): default=3s. How much time to waiting for first message with the same search criteria
+            consume(bool): optional. Parameter for overriding self.consume. If True, messages are received by
+                consumer(see _consume method, count and prefetch_count parameters), otherwise queue is polled every 0.1s
             queue(str): default self.queue. Parameter for overriding self.queue
             no_ack(bool): default True. See kombu.Consumer.no_ack attribute
             accept(str): default None. See kombu.Consumer.accept attribute
             wrapper(callable): default sefl.model.wrap. Callable object for wrapping deserialized response.message
             raw_response(bool): default False. If True, method returns raw kombu response. In this case all transformations and checks will be ignored
-            **filter_kwargs: kwargs for filter messages from queue by message attributes
+            message_headers(dict): optional. Values of message headers. Checked before body decoding
+            **filter_kwargs: kwargs for filter messages from queue by message attributes. If attributes are plain
+                fields of model, decoded messages are filtered by data keys and only matched messages are wrapped
 
         Returns:
             ListObject of Models
         """
         try:
+            if self.consume if consume is None else consume:
+                return self._consume(timeout=timeout, **kwargs)
             return waiter([0.1] * 10 * timeout).poll(
                 lambda x: x,
                 self._all,
@@ -136,30 +317,178 @@ class Amqp(BaseTransport):
             if not msg:
                 break
             lst.append(msg)
+        # channel stays open, so not acknowledged messages are returned to queue explicitly
+        if not no_ack:
+            for msg in lst:
+                msg.requeue()
         return lst
 
-    def __all_wrapped(self, queue, no_ack=True, accept=None, wrapper=None, **filter_kwargs):
+    def matcher(self, wrapper, message_headers=None, **filter_kwargs):
+        """Returns function, which returns wrapped message body if message matches filter, otherwise None.
+        Message headers are checked before body decoding. If filtered attributes are plain fields of model and
+        wrapper is model wrap(see Model.get_raw_keys), decoded body is filtered by data keys and only matched
+        messages are wrapped
+
+        Parameters:
+            wrapper(callable): callable object for wrapping deserialized message
+            message_headers(dict): optional. Values of message headers
+            **filter_kwargs: values of model attributes
+
+        Returns:
+            callable
+        """
+        # raw keys are resolved by model of wrapper: wrapper could be method of other model
+        get_raw_keys = getattr(getattr(wrapper, '__self__', None), 'get_raw_keys', None)
+        raw_keys = get_raw_keys(wrapper, filter_kwargs) if get_raw_keys is not None else None
+        raw_filter = None if raw_keys is None else [(raw_keys[name], value) for name, value in filter_kwargs.items()]
+
+        def match(message):
+            if message_headers:
+                headers = message.headers or {}
+                for key, value in message_headers.items():
+                    if headers.get(key) != value:
+                        return None
+            data = message.decode()
+            if raw_filter is not None and type(data) is dict:
+                for key, value in raw_filter:
+                    if data.get(key) != value:
+                        return None
+                return wrapper(data)
+            model = wrapper(data)
+            return model if compare_attrs(model, **filter_kwargs) else None
+        return match
+
+    def __all_wrapped(self, queue, no_ack=True, accept=None, wrapper=None, message_headers=None, **filter_kwargs):
         wrapper = wrapper or self.model.wrap
+        match = self.matcher(wrapper, message_headers=message_headers, **filter_kwargs)
         lst = ListObject(wrapper=wrapper)
+        unacked = []
         while True:
             msg = queue.get(no_ack=False, accept=accept)
             if not msg:
                 break
-            model = wrapper(msg.decode())
-            if compare_attrs(model, **filter_kwargs):
+            model = match(msg)
+            if model is not None:
                 lst.append(model)
                 if no_ack:
                     msg.ack()
+                    continue
+            unacked.append(msg)
+        # messages are requeued after draining, otherwise queue.get returns them again
+        for msg in unacked:
+            msg.requeue()
         return lst
 
     def _all(self, queue=None, no_ack=True, accept=None, wrapper=None, raw_response=False, **filter_kwargs):
         queue, = self.choose_arg(queue=queue)
-        with self.session as session:
-            queue = Queue(channel=session, name=queue)
-            return (
-                self.__all_raw(queue, no_ack=no_ack, accept=accept) if raw_response
-                else self.__all_wrapped(queue, no_ack=no_ack, accept=accept, wrapper=wrapper, **filter_kwargs)
-            )
+        queue = self.bind_queue(queue)
+        if raw_response:
+            return self.ensure(queue, self.__all_raw, queue, no_ack=no_ack, accept=accept)
+        return self.ensure(
+            queue, self.__all_wrapped, queue, no_ack=no_ack, accept=accept, wrapper=wrapper, **filter_kwargs
+        )
+
+    def _consume(self, timeout=3, count=None, prefetch_count=None, idle_timeout=0.1, mismatch='park', queue=None,
+                 no_ack=True, accept=None, wrapper=None, raw_response=False, message_headers=None, **filter_kwargs):
+        """Receives messages by consumer(basic_consume) without polling. Returns as soon as count of matched messages
+        is reached, or when messages stop arriving(idle_timeout) after the first match. Matched messages are
+        acknowledged if no_ack is True and requeued before returning otherwise. Messages are filtered by
+        matcher(see matcher method): only matched messages are wrapped
+
+        Parameters:
+            timeout(float): default 3s. Max time of waiting
+            count(int): optional. Count of matched messages, which is enough for returning
+            prefetch_count(int): optional. Max count of not acknowledged messages delivered to consumer. No limit by default
+            idle_timeout(float): default 0.1s. Time of waiting for next message after the first match
+            mismatch(str): default "park". What to do with not matched messages:
+                "park" - keep them in local buffer not acknowledged and requeue before returning. Every message is
+                    received once, but parked messages occupy prefetch_count slots: when all slots are occupied,
+                    consumer returns received results or raises Exception, if there are no matched messages yet
+                "requeue" - reject them with requeue immediately, so they are available for other consumers. Broker
+                    could deliver them to this consumer again: messages already rejected by this call are parked
+                    without decoding and don't prolong idle_timeout
+            message_headers(dict): optional. Values of message headers. Checked before body decoding
+
+        Returns:
+            ListObject of Models or list of kombu messages(raw_response=True)
+        """
+        if mismatch not in ('park', 'requeue'):
+            raise Exception('Unknown mismatch strategy: {}'.format(mismatch))
+        queue, = self.choose_arg(queue=queue)
+        wrapper = wrapper or self.model.wrap
+        match = self.matcher(wrapper, message_headers=message_headers, **filter_kwargs)
+        lst = [] if raw_response else ListObject(wrapper=wrapper)
+        unacked = []
+        rejected = set()
+        # time of the last delivery, which is not redelivery of rejected message
+        received = [None]
+
+        def on_message(message):
+            if count is not None and len(lst) >= count:
+                unacked.append(message)
+                return
+            if raw_response:
+                lst.append(message)
+            else:
+                key = None
+                if mismatch == 'requeue':
+                    # delivery tag is changed by redelivery, so rejected messages are recognized by content
+                    key = message.body, repr(message.headers)
+                    if key in rejected:
+                        unacked.append(message)
+                        return
+                received[0] = monotonic()
+                model = match(message)
+                if model is None:
+                    if key is not None:
+                        rejected.add(key)
+                        message.requeue()
+                    else:
+                        unacked.append(message)
+                    return
+                lst.append(model)
+            received[0] = monotonic()
+            if no_ack:
+                message.ack()
+            else:
+                unacked.append(message)
+
+        deadline = monotonic() + timeout
+        consumer = Consumer(
+            self.session.default_channel, queues=[self.bind_queue(queue)], on_message=on_message, accept=accept,
+            # queue is declared by "declare" method: redeclaration with other arguments closes shared channel
+            auto_declare=False,
+            # QoS of shared channel is always set: 0 resets limit of previous consumer
+            prefetch_count=prefetch_count or 0,
+        )
+        try:
+            with consumer:
+                while count is None or len(lst) < count:
+                    if prefetch_count and len(unacked) >= prefetch_count:
+                        # all prefetch slots are occupied by parked messages, nothing else could be delivered
+                        if not lst:
+                            raise Exception(
+                                'Prefetch window of {} messages is saturated by not matched messages, messages after '
+                                'them are not received. Increase prefetch_count'.format(prefetch_count)
+                            )
+                        break
+                    now = monotonic()
+                    remaining = deadline - now
+                    if lst:
+                        remaining = min(remaining, received[0] + idle_timeout - now)
+                    if remaining <= 0:
+                        break
+                    try:
+                        self.session.drain_events(timeout=remaining)
+                    except socket.timeout:
+                        if lst:
+                            break
+        finally:
+            for message in unacked:
+                message.requeue()
+        if not lst:
+            raise StopIteration
+        return lst
 
     def purge(self, queue=None, **kwargs):
         """ Purge queue
@@ -169,8 +498,8 @@ class Amqp(BaseTransport):
             **kwargs: kwargs for kombu.Queue.purge method
         """
         queue, = self.choose_arg(queue=queue)
-        with self.session as session:
-            Queue(channel=session, name=queue).purge(**kwargs)
+        queue = self.bind_queue(queue)
+        return self.ensure(queue, queue.purge, **kwargs)
 
     def delete(self, queue=None, **kwargs):
         """ Delete queue
@@ -180,5 +509,5 @@ class Amqp(BaseTransport):
             **kwargs: kwargs for kombu.Queue.delete method
         """
         queue, = self.choose_arg(queue=queue)
-        with self.session as session:
-            Queue(channel=session, name=queue).delete(**kwargs)
+        queue = self.bind_queue(queue)
+        return self.ensure(queue, queue.delete, **kwargs)
@@ -14,25 +14,110 @@
 * limitations under the License.
 """
 
+from contextlib import asynccontextmanager, contextmanager
 from functools import reduce
+from itertools import groupby
+from threading import Lock, local
 
 from pypika import Query, Table
-from sqlalchemy import create_engine
+from pypika.terms import Parameter
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from arsenalqa.base.transports import BaseTransport
 
 
 class SingleEngine:
+    """
+    Creates one engine per url and engine parameters. Engines are created once even if transports are created from
+    several threads at the same time
+
+    Parameters:
+        url(str): db url
+        **kwargs: sqlalchemy create_engine parameters, e.g. pool_size, max_overflow, pool_recycle, pool_pre_ping
+    """
+
     urls = {}
+    lock = Lock()
+    scoped = local()
 
-    def __new__(cls, url):
-        session = cls.urls.get(url)
+    def __new__(cls, url, **kwargs):
+        key = (url, repr(sorted(kwargs.items())))
+        session = cls.urls.get(key)
         if session is None:
-            session = create_engine(url)
-            session.connect()
-            cls.urls[url] = session
+            with cls.lock:
+                session = cls.urls.get(key)
+                if session is None:
+                    session = cls.urls[key] = cls.create(url, **kwargs)
         return session
 
+    @staticmethod
+    def create(url, **kwargs):
+        session = create_engine(url, **kwargs)
+        session.connect().close()
+        return session
+
+    @staticmethod
+    def stats(session):
+        """Returns connection pool statistics of engine
+
+        Returns:
+            dict: pool size, checked in and checked out connections, overflow and pool status string
+        """
+        pool = getattr(session, 'sync_engine', session).pool
+        stats = {'status': pool.status()}
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            method = getattr(pool, name, None)
+            stats[name] = method() if method is not None else None
+        return stats
+
+    @classmethod
+    def connections(cls):
+        """Returns connections pinned to current thread: {engine: connection}"""
+        return cls._scoped('connections')
+
+    @classmethod
+    def buffers(cls):
+        """Returns statement buffers of transactions in current thread: {engine: StatementBuffer}"""
+        return cls._scoped('buffers')
+
+    @classmethod
+    def _scoped(cls, name):
+        scoped = getattr(cls.scoped, name, None)
+        if scoped is None:
+            scoped = {}
+            setattr(cls.scoped, name, scoped)
+        return scoped
+
+
+class StatementBuffer(list):
+    """
+    Write statements deferred by Db.transaction. Consecutive statements of the same shape are flushed by one executemany
+
+    Parameters:
+        size(int): statements count, which triggers flush
+    """
+
+    def __init__(self, size):
+        super(StatementBuffer, self).__init__()
+        self.size = size
+
+    def flush(self, connection):
+        for statement, group in groupby(self, key=lambda x: x[0]):
+            params = [i[1] for i in group]
+            connection.execute(statement, params if len(params) > 1 else params[0])
+        self.clear()
+
+
+class AsyncSingleEngine(SingleEngine):
+    urls = {}
+    lock = Lock()
+
+    @staticmethod
+    def create(url, **kwargs):
+        return create_async_engine(url, **kwargs)
+
 
 class Db(BaseTransport):
     """
@@ -40,14 +125,22 @@ class Db(BaseTransport):
         host(str): optional first part of url
         url(str): db url. Url and host are used if session parameter is None only
         table(str): database tablename
-        session(kombu.Connection): optional. Instance of kombu Connection object
+        session(sqlalchemy.engine.Engine): optional. Instance of sqlalchemy Engine or Connection object
         query: default pypika.Query type.
         model(Model): default FakeModel. Model which will be used in transport for send data and wrap response by default
+        engine_kwargs(dict): optional. Parameters for engine creation(pool_size, max_overflow, pool_recycle,
+            pool_pre_ping, etc.). Used if session parameter is None only
+
+    All statements are sent with bound parameters. Statements are built once per shape(operation, table, columns,
+    filter keys) and cached in Db.statements, so repeated calls with different values reuse the same statement
     """
 
-    def __init__(self, host=None, url=None, table=None, session=None, query=Query, **kwargs):
+    statements = {}
+    engine = SingleEngine
+
+    def __init__(self, host=None, url=None, table=None, session=None, query=Query, engine_kwargs=None, **kwargs):
         super(Db, self).__init__(host=host, url=url, **kwargs)
-        self.session = session or SingleEngine(self.prepare_url(host, url))
+        self.session = session or self.engine(self.prepare_url(host, url), **(engine_kwargs or {}))
         self.table = Table(table)
         self.query = query
 
@@ -62,8 +155,135 @@ class Db(BaseTransport):
         Parameters:
             data(any): optional. Parameter for overriding self.model
         """
-        data = self.chose_data(data)
-        return self.execute(str(self.query.into(self.table).columns(*data.keys()).insert(*data.values())))
+        return self._write(*self._insert_statement(self.chose_data(data)))
+
+    def _insert_statement(self, data):
+        columns = tuple(data)
+        statement = self._statement(
+            ('insert', columns),
+            lambda: self.query.into(self.table).columns(*columns).insert(*self._parameters('v', len(columns)))
+        )
+        return statement, self._values('v', data.values())
+
+    def insert_many(self, data, batch_size=1000):
+        """Method for bulk insertion. Raws are grouped by columns set and inserted by executemany of parametrized
+        INSERT statement: one executemany and one transaction per batch
+
+        Parameters:
+            data(Iterable): ListObject, list of Models or list of dicts
+            batch_size(int): default 1000. Max raws count per statement
+
+        Returns:
+            inserted raws count
+        """
+        count = 0
+        self._flush()
+        for statement, batch in self._insert_batches(data, batch_size):
+            with self._begin() as connection:
+                connection.execute(statement, batch)
+            count += len(batch)
+        return count
+
+    def _insert_batches(self, data, batch_size):
+        groups = {}
+        for row in getattr(data, 'data', data):
+            row = self.chose_data(row)
+            groups.setdefault(frozenset(row), []).append(row)
+        for rows in groups.values():
+            columns = tuple(rows[0])
+            statement = self._insert_statement(rows[0])[0]
+            for start in range(0, len(rows), batch_size):
+                yield statement, [
+                    self._values('v', (row[column] for column in columns)) for row in rows[start:start + batch_size]
+                ]
+
+    @contextmanager
+    def _begin(self):
+        connection = self._connection()
+        if isinstance(connection, Engine):
+            with connection.begin() as connection:
+                yield connection
+        elif connection.in_transaction():
+            yield connection
+        else:
+            with connection.begin():
+                yield connection
+
+    @contextmanager
+    def transaction(self, buffer_size=None):
+        """Unit of work for write-heavy setups. Pins connection to current thread(see Db.connection) and runs all
+        statements of Db transports with the same engine in one transaction: commits at block exit, rollbacks on
+        exception. Nested blocks join the outer transaction
+
+        Parameters:
+            buffer_size(int): optional. If set, insert, update and delete statements are deferred and flushed by
+                groups of buffer_size statements(same statements are sent by one executemany). Deferred methods return
+                None. Buffer is flushed before any other statement, so selects see all previous writes
+
+        Yields:
+            sqlalchemy Connection
+
+        >>> with MyModel.db.transaction(buffer_size=500):
+        >>>     for i in range(1000):
+        >>>         MyModel(id=i).db.insert()
+        """
+        with self.connection() as connection:
+            if connection.in_transaction():
+                yield connection
+                return
+            buffers = SingleEngine.buffers()
+            if buffer_size:
+                buffers[self.session] = StatementBuffer(buffer_size)
+            try:
+                with connection.begin():
+                    yield connection
+                    self._flush()
+            finally:
+                buffers.pop(self.session, None)
+
+    def _flush(self):
+        buffer = SingleEngine.buffers().get(self.session)
+        if buffer:
+            buffer.flush(self._connection())
+
+    def _write(self, statement, params):
+        buffer = SingleEngine.buffers().get(self.session)
+        if buffer is None:
+            return self.execute(statement, params)
+        buffer.append((statement, params))
+        if len(buffer) >= buffer.size:
+            buffer.flush(self._connection())
+
+    @contextmanager
+    def connection(self):
+        """Pins one connection from engine pool to current thread. Inside the block all Db transports of this engine
+        run their statements on the pinned connection instead of checking out connection per statement.
+        Nested blocks reuse the same connection
+
+        Yields:
+            sqlalchemy Connection
+
+        >>> with MyModel.db.connection():
+        >>>     MyModel(id=1).db.get()
+        >>>     MyModel(id=2).db.get()
+        """
+        connections = SingleEngine.connections()
+        if not isinstance(self.session, Engine) or self.session in connections:
+            yield connections.get(self.session, self.session)
+            return
+        connection = connections[self.session] = self.session.connect()
+        try:
+            yield connection
+        finally:
+            del connections[self.session]
+            connection.close()
+
+    def _connection(self):
+        return SingleEngine.connections().get(self.session, self.session)
+
+    def pool_stats(self):
+        """Returns connection pool statistics of transport engine. See SingleEngine.stats"""
+        return SingleEngine.stats(self.session)
 
     def get(self, **kwargs):
         """ Select single filtered raw from database. Raises Exception if raws count != 1. By default this method filters
@@ -80,8 +300,26 @@ class Db(BaseTransport):
             raise Exception('Rows count for get method != 1: {}'.format(result))
         return result[0]
 
-    def __reduce_kwargs(self, kwargs):
-        return reduce(lambda x, y: x & y, [(getattr(self.table, key) == value) for key, value in kwargs.items()])
+    def _statement(self, shape, build):
+        key = (self.query, str(self.table)) + shape
+        statement = self.statements.get(key)
+        if statement is None:
+            statement = self.statements[key] = text(str(build()))
+        return statement
+
+    @staticmethod
+    def _parameters(prefix, count):
+        return [Parameter(':{}{}'.format(prefix, i)) for i in range(count)]
+
+    @staticmethod
+    def _values(prefix, values):
+        return {'{}{}'.format(prefix, i): value for i, value in enumerate(values)}
+
+    def __reduce_kwargs(self, keys):
+        return reduce(
+            lambda x, y: x & y,
+            [(getattr(self.table, key) == parameter) for key, parameter in zip(keys, self._parameters('f', len(keys)))]
+        )
 
     def all(self, wrapper=None, limit=10, offset=0, **kwargs):
         """Method for selecting list of filtered raws. By default this method filters raws from table by "filter_kwargs".
@@ -96,11 +334,111 @@ class Db(BaseTransport):
             ListObject of Models
         """
         wrapper = wrapper or self.model.wrap
-        statement = self.query.from_(self.table).select('*')
-        if kwargs:
-            statement = statement.where(self.__reduce_kwargs(kwargs))
-        statement = statement.limit(limit).offset(offset)
-        return wrapper([dict(i) for i in self.execute(str(statement))])
+        return wrapper([dict(i) for i in self.execute(*self._select(limit, offset, kwargs))])
+
+    def iter_all(self, wrapper=None, chunk_size=1000, chunks=False, limit=None, offset=0, **kwargs):
+        """Streaming version of "all" method. Raws are fetched from server-side cursor by chunks, so memory usage
+        doesn't depend on table size. Connection is held until generator is exhausted or closed
+
+        Parameters:
+            wrapper(callable): default self.model.wrap
+            chunk_size(int): default 1000. Count of raws fetched from cursor at once
+            chunks(bool): default False. If True, yields ListObject of Models per chunk instead of single Models
+            limit(int): optional. Limit of selected and filtered raws. By default all filtered raws are selected
+            offset(int): default 0. Table raws start position
+            **filter_kwargs: kwargs for filter raws from table by table fields
+
+        Yields:
+            Model or ListObject of Models
+        """
+        wrapper = wrapper or self.model.wrap
+        statement, params = self._select(limit, offset, kwargs)
+        self._flush()
+        session = self._connection()
+        # pinned connection or Connection session is used as is: own connection is checked out from Engine only
+        connection = session.connect() if isinstance(session, Engine) else session
+        try:
+            result = connection.execution_options(stream_results=True).execute(statement, params)
+            try:
+                while True:
+                    rows = result.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    if chunks:
+                        yield wrapper([dict(i) for i in rows])
+                    else:
+                        for row in rows:
+                            yield wrapper(dict(row))
+            finally:
+                result.close()
+        finally:
+            if connection is not session:
+                connection.close()
+
+    def pages(self, key=None, page_size=100, after=None, wrapper=None, **kwargs):
+        """Keyset pagination over filtered raws. Every page is selected by "WHERE key > last seen key ORDER BY key", so
+        database doesn't scan skipped raws like with offset. Key column should be unique, non-null and indexed: raws with
+        NULL key are not selected
+
+        Parameters:
+            key(str): optional. Column for ordering and seeking. By default data key of single model filter field
+            page_size(int): default 100. Raws count per page
+            after(any): optional. Pagination starts after this key value. By default from the first raw
+            wrapper(callable): default self.model.wrap
+            **filter_kwargs: kwargs for filter raws from table by table fields
+
+        Yields:
+            ListObject of Models per page
+
+        >>> for page in User.db.pages(key='id', page_size=1000, status='active'):
+        >>>     ...
+        """
+        key = key or self._default_key()
+        wrapper = wrapper or self.model.wrap
+        while True:
+            rows = [dict(i) for i in self.execute(*self._select(page_size, 0, kwargs, key=key, after=after))]
+            if not rows:
+                return
+            yield wrapper(rows)
+            if len(rows) < page_size:
+                return
+            after = rows[-1][key]
+
+    def _default_key(self):
+        filter_fields = list(self.model._filter_fields)
+        if len(filter_fields) != 1:
+            raise Exception('Key column is required for pagination, model filter fields: {}'.format(filter_fields))
+        return self.model.get_field_key(filter_fields[0])
+
+    def _select(self, limit, offset, kwargs, key=None, after=None):
+        keys = tuple(kwargs)
+        seek = after is not None
+
+        def build():
+            statement = self.query.from_(self.table).select('*')
+            criterion = self.__reduce_kwargs(keys) if keys else None
+            if key is not None:
+                # raws with NULL key can't be sought: "key > NULL" never matches, so they are skipped
+                key_criterion = getattr(self.table, key).notnull()
+                if seek:
+                    key_criterion = getattr(self.table, key) > Parameter(':after')
+                criterion = key_criterion if criterion is None else criterion & key_criterion
+            if criterion is not None:
+                statement = statement.where(criterion)
+            if key is not None:
+                statement = statement.orderby(key)
+            if limit is not None:
+                statement = statement.limit(Parameter(':limit'))
+            if offset:
+                statement = statement.offset(Parameter(':offset'))
+            return statement
+
+        statement = self._statement(('select', keys, key, seek, limit is not None, bool(offset)), build)
+        params = self._values('f', kwargs.values())
+        for name, value in (('after', after), ('limit', limit), ('offset', offset or None)):
+            if value is not None:
+                params[name] = value
+        return statement, params
 
     def update(self, data=None, **kwargs):
         """Method for updating raws  in table. By default all raws filters by two criteria: self.model.data_filter() +
@@ -113,15 +451,24 @@ class Db(BaseTransport):
         >>> model.data = {"name": "Andrew", "id": "1"}  # our update
         >>> model.db.update(name="Jhon")  # will update raw in table with id=1 and name="Jhon" to id=1 and name="Andrew"
         """
+        return self._write(*self._update_statement(data, kwargs))
+
+    def _update_statement(self, data, kwargs):
         kwargs = self._join_filter(kwargs)
         data = self.chose_data(data)
         if not kwargs:
             raise Exception('Filter criteria are required for update!')
-        statement = self.query.update(self.table)
-        for key, value in data.items():
-            statement = statement.set(key, value)
-        statement = statement.where(self.__reduce_kwargs(kwargs))
-        return self.execute(str(statement))
+        columns, keys = tuple(data), tuple(kwargs)
+
+        def build():
+            statement = self.query.update(self.table)
+            for column, parameter in zip(columns, self._parameters('v', len(columns))):
+                statement = statement.set(column, parameter)
+            return statement.where(self.__reduce_kwargs(keys))
+
+        params = self._values('v', data.values())
+        params.update(self._values('f', kwargs.values()))
+        return self._statement(('update', columns, keys), build), params
 
     def delete(self, **kwargs):
         """Method for deleting raws  in table. By default all raws filters by two criteria: self.model.data_filter() +
@@ -130,16 +477,219 @@ class Db(BaseTransport):
         Parameters:
              **kwargs: filter criteria for deleting
         """
+        return self._write(*self._delete_statement(kwargs))
+
+    def _delete_statement(self, kwargs):
         kwargs = self._join_filter(kwargs)
         if not kwargs:
             raise Exception('Filter criteria are required for deletion!')
-        return self.execute(str(self.query.from_(self.table).delete().where(self.__reduce_kwargs(kwargs))))
+        keys = tuple(kwargs)
+        statement = self._statement(
+            ('delete', keys), lambda: self.query.from_(self.table).delete().where(self.__reduce_kwargs(keys))
+        )
+        return statement, self._values('f', kwargs.values())
 
-    def execute(self, statement, **kwargs):
-        """Single point to work with database. Executes query strings to database from others methods
+    def execute(self, statement, params=None, **kwargs):
+        """Single point to work with database. Executes statements to database from others methods
 
         Parameters:
-            statement(str): sql query
+            statement(Union[str, sqlalchemy.sql.expression.TextClause]): sql query
+            params(Union[dict, list]): optional. Bound parameters of statement. List of dicts executes statement
+                by executemany
             **kwargs: kwargs for sqlalchemy engine execute method
         """
-        return self.session.execute(statement, **kwargs)
+        self._flush()
+        session = self._connection()
+        if params is None:
+            return session.execute(statement, **kwargs)
+        return session.execute(statement, params, **kwargs)
+
+
+class AsyncDb(Db):
+    """
+    Asynchronous version of Db transport on SQLAlchemy asyncio engine. All methods are coroutines(iter_all and pages
+    are async generators) with the same parameters as Db methods.
+
+    Parameters:
+        host(str): optional first part of url
+        url(str): db url with async driver, e.g. "sqlite+aiosqlite:///test.db". Used if session parameter is None only
+        table(str): database tablename
+        session(sqlalchemy.ext.asyncio.AsyncEngine): optional. Instance of AsyncEngine or AsyncConnection object
+        query: default pypika.Query type.
+        model(Model): default FakeModel. Model which will be used in transport for send data and wrap response by default
+
+    >>> class MyModel(Model):
+    >>>    db = TransportManager(AsyncDb, url='sqlite+aiosqlite:///test.db', table='users')
+    >>>
+    >>> users = await asyncio.gather(*[MyModel(id=i).db.get() for i in range(100)])
+    """
+
+    engine = AsyncSingleEngine
+
+    def transaction(self, buffer_size=None):
+        """Not supported: statements of AsyncDb are executed in own transaction each. To run statements in one
+        transaction create transport with AsyncConnection as session, e.g. AsyncDb(session=connection, table='users')
+        inside "async with engine.begin() as connection" block
+        """
+        raise Exception('AsyncDb does not support transaction method, pass AsyncConnection as session instead')
+
+    def connection(self):
+        """Not supported: connections of AsyncEngine can't be pinned to thread. Pass AsyncConnection as session"""
+        raise Exception('AsyncDb does not support connection method, pass AsyncConnection as session instead')
+
+    def _flush(self):
+        raise Exception('AsyncDb does not support statement buffers')
+
+    async def insert(self, data=None):
+        """Method for insertion your data into database
+
+        Parameters:
+            data(any): optional. Parameter for overriding self.model
+        """
+        return await self.execute(*self._insert_statement(self.chose_data(data)))
+
+    async def insert_many(self, data, batch_size=1000):
+        """Method for bulk insertion. Raws are grouped by columns set and inserted by executemany of parametrized
+        INSERT statement: one executemany and one transaction per batch
+
+        Parameters:
+            data(Iterable): ListObject, list of Models or list of dicts
+            batch_size(int): default 1000. Max raws count per statement
+
+        Returns:
+            inserted raws count
+        """
+        count = 0
+        for statement, batch in self._insert_batches(data, batch_size):
+            await self.execute(statement, batch)
+            count += len(batch)
+        return count
+
+    async def get(self, **kwargs):
+        """ Select single filtered raw from database. Raises Exception if raws count != 1. By default this method filters
+        raw from database by self.model.model_filter() method + "filter_kwargs"
+
+        Parameters:
+            **kwargs: parameters for method all
+
+        Returns:
+            prepared response(usually Model instance)
+        """
+        result = await self.all(**self._join_filter(kwargs))
+        if len(result) != 1:
+            raise Exception('Rows count for get method != 1: {}'.format(result))
+        return result[0]
+
+    async def all(self, wrapper=None, limit=10, offset=0, **kwargs):
+        """Method for selecting list of filtered raws. Filter_kwargs are used with "AND" operator
+
+        Parameters:
+            wrapper(callable): default self.model.wrap
+            limit(int): default 10. Limit of selected and filtered raws
+            offset(int): default 0. Table raws start position
+            **filter_kwargs: kwargs for filter raws from table by table fields
+
+        Returns:
+            ListObject of Models
+        """
+        wrapper = wrapper or self.model.wrap
+        result = await self.execute(*self._select(limit, offset, kwargs))
+        return wrapper([dict(i) for i in result.mappings()])
+
+    async def iter_all(self, wrapper=None, chunk_size=1000, chunks=False, limit=None, offset=0, **kwargs):
+        """Streaming version of "all" method(async generator). Raws are fetched from server-side cursor by chunks.
+        Connection is held until generator is exhausted or closed
+
+        Parameters:
+            wrapper(callable): default self.model.wrap
+            chunk_size(int): default 1000. Count of raws fetched from cursor at once
+            chunks(bool): default False. If True, yields ListObject of Models per chunk instead of single Models
+            limit(int): optional. Limit of selected and filtered raws. By default all filtered raws are selected
+            offset(int): default 0. Table raws start position
+            **filter_kwargs: kwargs for filter raws from table by table fields
+
+        Yields:
+            Model or ListObject of Models
+        """
+        wrapper = wrapper or self.model.wrap
+        statement, params = self._select(limit, offset, kwargs)
+        async with self._connect() as connection:
+            result = await connection.stream(statement, params)
+            async for rows in result.mappings().partitions(chunk_size):
+                if chunks:
+                    yield wrapper([dict(i) for i in rows])
+                else:
+                    for row in rows:
+                        yield wrapper(dict(row))
+
+    async def pages(self, key=None, page_size=100, after=None, wrapper=None, **kwargs):
+        """Keyset pagination over filtered raws(async generator). Key column should be unique, non-null and indexed:
+        raws with NULL key are not selected. See Db.pages
+
+        Parameters:
+            key(str): optional. Column for ordering and seeking. By default data key of single model filter field
+            page_size(int): default 100. Raws count per page
+            after(any): optional. Pagination starts after this key value. By default from the first raw
+            wrapper(callable): default self.model.wrap
+            **filter_kwargs: kwargs for filter raws from table by table fields
+
+        Yields:
+            ListObject of Models per page
+        """
+        key = key or self._default_key()
+        wrapper = wrapper or self.model.wrap
+        while True:
+            result = await self.execute(*self._select(page_size, 0, kwargs, key=key, after=after))
+            rows = [dict(i) for i in result.mappings()]
+            if not rows:
+                return
+            yield wrapper(rows)
+            if len(rows) < page_size:
+                return
+            after = rows[-1][key]
+
+    async def update(self, data=None, **kwargs):
+        """Method for updating raws in table. By default all raws filters by two criteria: self.model.data_filter() +
+        kwargs. But kwargs overrides self.model.data_filter().
+
+        Parameters:
+            data(dict): optional. Parameter for overriding self.model
+            **kwargs: filter criteria for updating
+        """
+        return await self.execute(*self._update_statement(data, kwargs))
+
+    async def delete(self, **kwargs):
+        """Method for deleting raws in table. By default all raws filters by two criteria: self.model.data_filter() +
+        kwargs. But kwargs overrides self.model.data_filter().
+
+        Parameters:
+             **kwargs: filter criteria for deleting
+        """
+        return await self.execute(*self._delete_statement(kwargs))
+
+    @asynccontextmanager
+    async def _connect(self):
+        if isinstance(self.session, AsyncEngine):
+            async with self.session.connect() as connection:
+                yield connection
+        else:
+            yield self.session
+
+    async def execute(self, statement, params=None, **kwargs):
+        """Single point to work with database. Executes statements in own transaction, if session is AsyncEngine
+
+        Parameters:
+            statement(Union[str, sqlalchemy.sql.expression.TextClause]): sql query
+            params(Union[dict, list]): optional. Bound parameters of statement. List of dicts executes statement
+                by executemany
+            **kwargs: kwargs for sqlalchemy AsyncConnection execute method
+
+        Returns:
+            buffered sqlalchemy Result
+        """
+        if isinstance(statement, str):
+            statement = text(statement)
+        if isinstance(self.session, AsyncEngine):
+            async with self.session.begin() as connection:
+                return await connection.execute(statement, params, **kwargs)
+        return await self.session.execute(statement, params, **kwargs)
@@ -14,14 +14,295 @@
 * limitations under the License.
 """
 
+import marshal
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from email.message import Message
+from itertools import islice
+from threading import Lock
+from time import monotonic
+from urllib.parse import urljoin, urlparse
+
+from requests.adapters import HTTPAdapter
 from requests.sessions import merge_setting
 from requests.structures import CaseInsensitiveDict
 
 from requests import Session
 
 from arsenalqa.base.exceptions import assert_response_status
+from arsenalqa.base.iterables import ListObject
 from arsenalqa.base.transports import BaseTransport, FakeModel
-from arsenalqa.transports import Serializer
+from arsenalqa.base.utils import Dummy
+from arsenalqa.transports import Serializer, iter_json_array
+
+
+class LazyResponse:
+    """
+    Proxy of prepared response. Response content is deserialized and wrapped on first access to the proxy(attribute,
+    item, iteration, comparison, isinstance check, etc.), so requests which results are not used skip parsing
+
+    Parameters:
+        raw_response(requests.Response): response object, available as attribute of proxy
+        load(callable): function without arguments, which returns prepared response
+
+    >>> user = User(id=1).http.get(expected_status=200, lazy=True)  # status is checked, content is not parsed
+    >>> print(user.raw_response.status_code)
+    200
+    >>> print(user.name)  # content is parsed and wrapped here
+    test
+    """
+
+    __slots__ = ('raw_response', '_load', '_target')
+
+    def __init__(self, raw_response, load):
+        object.__setattr__(self, 'raw_response', raw_response)
+        object.__setattr__(self, '_load', load)
+        object.__setattr__(self, '_target', Dummy)
+
+    @property
+    def __wrapped__(self):
+        target = object.__getattribute__(self, '_target')
+        if target is Dummy:
+            target = object.__getattribute__(self, '_load')()
+            object.__setattr__(self, '_target', target)
+            object.__setattr__(self, '_load', None)
+        return target
+
+    @property
+    def __class__(self):
+        return type(self.__wrapped__)
+
+    def __getattr__(self, item):
+        return getattr(self.__wrapped__, item)
+
+    def __setattr__(self, key, value):
+        setattr(self.__wrapped__, key, value)
+
+    def __delattr__(self, item):
+        delattr(self.__wrapped__, item)
+
+    def __getitem__(self, item):
+        return self.__wrapped__[item]
+
+    def __setitem__(self, key, value):
+        self.__wrapped__[key] = value
+
+    def __delitem__(self, key):
+        del self.__wrapped__[key]
+
+    def __iter__(self):
+        return iter(self.__wrapped__)
+
+    def __len__(self):
+        return len(self.__wrapped__)
+
+    def __contains__(self, item):
+        return item in self.__wrapped__
+
+    def __bool__(self):
+        return bool(self.__wrapped__)
+
+    def __eq__(self, other):
+        return self.__wrapped__ == other
+
+    def __ne__(self, other):
+        return self.__wrapped__ != other
+
+    def __hash__(self):
+        return hash(self.__wrapped__)
+
+    def __repr__(self):
+        return repr(self.__wrapped__)
+
+    def __str__(self):
+        return str(self.__wrapped__)
+
+
+class CacheEntry:
+    """Cached response with snapshot of its deserialized content. See ResponseCache.
+    Snapshot is marshalled(pickled if content has not built-in types), restoring of it is faster than
+    deserialization of content and gives independent copy of data for every wrapped response"""
+
+    __slots__ = ('response', 'loads', 'snapshot', 'expires')
+
+    def __init__(self, response, payload, expires):
+        self.response = response
+        try:
+            self.loads, self.snapshot = marshal.loads, marshal.dumps(payload)
+        except ValueError:
+            self.loads, self.snapshot = pickle.loads, pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+        self.expires = expires
+
+    def payload(self):
+        """Returns new copy of deserialized content"""
+        return self.loads(self.snapshot)
+
+    @property
+    def fresh(self):
+        return monotonic() < self.expires
+
+    def validators(self):
+        """Returns headers for conditional request built from ETag and Last-Modified headers of response"""
+        headers = {}
+        etag = self.response.headers.get('ETag')
+        if etag:
+            headers['If-None-Match'] = etag
+        last_modified = self.response.headers.get('Last-Modified')
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Cache of deserialized contents of successful(200) GET responses for Http transport. Entry is used without requests
+    during ttl seconds. Stale entry with ETag or Last-Modified header is revalidated by conditional request: response
+    304 refreshes the entry, content is not transferred and parsed again. Least recently used entries are evicted when
+    count of entries exceeds maxsize. One cache could be shared by transports of many models.
+    Responses with "Cache-Control: no-store" header are not cached
+
+    Parameters:
+        ttl(float): default 60. Seconds during which entry is used without requests
+        maxsize(int): default 256. Max count of entries
+        headers(Iterable[str]): default ('Accept', 'Accept-Language', 'Authorization'). Request headers which values
+            are part of cache key in addition to method, url, params, body and serializer
+
+    >>> catalog = ResponseCache(ttl=300)
+    >>>
+    >>> class Item(Model):
+    >>>     http = TransportManager(Http, url='http://example.com/items/{id}', cache=catalog)
+    >>>
+    >>> items = [Item(id=1).http.get(expected_status=200) for _ in range(100)]
+    >>> print(catalog.stats())
+    {'hits': 99, 'misses': 1, 'revalidations': 0, 'size': 1}
+    """
+
+    def __init__(self, ttl=60, maxsize=256, headers=('Accept', 'Accept-Language', 'Authorization')):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.headers = tuple(headers)
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def key(self, method, url, params, headers, serializer, data=None):
+        """Returns cache key of request. Headers should be case-insensitive dict, data is serialized request body"""
+        if not (data is None or isinstance(data, (str, bytes))):
+            data = repr(data)
+        return method.upper(), url, repr(params), tuple(headers.get(name) for name in self.headers), serializer, data
+
+    def get(self, key):
+        """Returns CacheEntry or None. Entry could be stale"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, response, payload):
+        """Stores snapshot of deserialized content of response, if response could be cached"""
+        if response.status_code != 200 or 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+        entry = CacheEntry(response, payload, monotonic() + self.ttl)
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def refresh(self, entry):
+        """Marks entry as fresh again after successful revalidation"""
+        entry.expires = monotonic() + self.ttl
+        self.count('revalidations')
+
+    def count(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """Returns hits, misses, revalidations counters and count of entries"""
+        return {'hits': self.hits, 'misses': self.misses, 'revalidations': self.revalidations, 'size': len(self.entries)}
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class SingleAdapter:
+    """
+    Creates one requests HTTPAdapter(urllib3 connection pool) per host and pool parameters, so all Http transports of
+    the same host reuse opened keep-alive connections. Sessions are not shared: headers and cookies stay per transport
+
+    Parameters:
+        url(str): url or host. Adapter is chosen by scheme and netloc
+        pool_connections(int): default 10. Count of cached urllib3 connection pools
+        pool_maxsize(int): default 10. Max count of kept-alive connections per pool
+        max_retries(Union[int, urllib3.util.Retry]): default 0. Retries of failed connections
+        pool_block(bool): default False. If True, requests wait for free connection instead of opening new ones
+    """
+
+    adapters = {}
+    lock = Lock()
+
+    def __new__(cls, url, pool_connections=10, pool_maxsize=10, max_retries=0, pool_block=False):
+        key = (cls.prefix(url), pool_connections, pool_maxsize, repr(max_retries), pool_block)
+        adapter = cls.adapters.get(key)
+        if adapter is None:
+            with cls.lock:
+                adapter = cls.adapters.get(key)
+                if adapter is None:
+                    adapter = cls.adapters[key] = HTTPAdapter(
+                        pool_connections=pool_connections,
+                        pool_maxsize=pool_maxsize,
+                        max_retries=max_retries,
+                        pool_block=pool_block,
+                    )
+        return adapter
+
+    @staticmethod
+    def prefix(url):
+        url = urlparse(url or '')
+        return '{}://{}'.format(url.scheme, url.netloc) if url.scheme and url.netloc else None
+
+    @classmethod
+    def session(cls, url, **kwargs):
+        """Creates new requests Session with shared adapter mounted for url host(or for all http/https urls, if url
+        has no host)
+
+        Parameters:
+            url(str): url or host
+            **kwargs: SingleAdapter parameters
+        """
+        session = Session()
+        adapter = cls(url, **kwargs)
+        prefix = cls.prefix(url)
+        for prefix in ((prefix,) if prefix else ('http://', 'https://')):
+            session.mount(prefix, adapter)
+        return session
+
+    @staticmethod
+    def stats(adapter):
+        """Returns connection reuse statistics of adapter
+
+        Returns:
+            dict: opened connections, sent requests and reuse rate(share of requests sent over already opened
+            connections)
+        """
+        pools = adapter.poolmanager.pools
+        connections = requests = 0
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            requests += pool.num_requests
+        return {
+            'connections': connections,
+            'requests': requests,
+            'reuse_rate': 1 - connections / requests if requests else 0.0,
+        }
 
 
 class Http(BaseTransport):
@@ -31,11 +312,26 @@ class Http(BaseTransport):
         url(str): url with "format" like mask: "http://example.com/users/{id}/". In this example "id" takes from model.data. If model attribute "id" will be blank, then url looks like "http://example.com/users/"
         session(requests.Session): optional. Instance of requests Session object
         model(Model): default FakeModel. Model which will be used in transport for send data and wrap response by default
-        serializer(str): default "json". Name of serializer module which should have two methods: dumps and loads
+        serializer(str): default "json". Name of registered codec(json, orjson, ujson, msgpack) or of module which
+            should have two methods: dumps and loads. See Serializer
+        pool_kwargs(dict): optional. SingleAdapter parameters(pool_connections, pool_maxsize, max_retries, pool_block).
+            Used if session parameter is None only. By default new session reuses connection pool shared by host
+        lazy(bool): default False. If True, requests return LazyResponse: content is deserialized and wrapped on
+            first access only
+        cache(ResponseCache): optional. Cache for GET responses. Not used for stream and raw_response requests
     """
-    
-    def __init__(self, session=None, **kwargs):
-        super(Http, self).__init__(session=session or Session(), **kwargs)
+    stream_read_size = 64 * 1024
+
+    def __init__(self, session=None, pool_kwargs=None, lazy=False, cache=None, **kwargs):
+        if session is None:
+            session = SingleAdapter.session(urljoin(kwargs.get('host') or '', kwargs.get('url') or ''), **(pool_kwargs or {}))
+        super(Http, self).__init__(session=session, **kwargs)
+        self.lazy = lazy
+        self.cache = cache
+
+    def pool_stats(self):
+        """Returns connection reuse statistics of adapter used for self.url. See SingleAdapter.stats"""
+        return SingleAdapter.stats(self.session.get_adapter(self.prepare_url()))
 
     def prepare_request(self, data=None, headers=None, serializer=None, **serializer_kwargs):
         """Method for data preparation before sending. Used in "request" method.
@@ -47,15 +343,29 @@ class Http(BaseTransport):
             **serializer_kwargs: optional arguments for serializer module
 
         Returns:
-            serialized data, headers
+            serialized data, headers. Content-Type of serializer is added to headers, if neither headers
+            nor session headers have it
         """
+        serializer = serializer or self.serializer
         data = Serializer.dumps(
             target=self.chose_data(data),
             serializer=serializer, **serializer_kwargs
         )
         headers = headers or {}
+        content_type = Serializer.content_type(serializer)
+        if content_type and not self.has_header('Content-Type', headers):
+            headers = dict(headers)
+            headers['Content-Type'] = content_type
         return data, headers
 
+    def has_header(self, name, headers=None):
+        """Checks header in headers and in session headers. Names are case-insensitive"""
+        name = name.lower()
+        for keys in (headers or (), getattr(self.session, 'headers', None) or ()):
+            if any(key.lower() == name for key in keys):
+                return True
+        return False
+
     def prepare_response(self,
                          response,
                          method,
@@ -67,6 +377,7 @@ class Http(BaseTransport):
                          data,
                          raw_response,
                          serializer,
+                         lazy=False,
                          **serializer_kwargs
                          ):
         """Method for response preparation before returning. Used in "request" method
@@ -84,6 +395,7 @@ class Http(BaseTransport):
             data: request parameter for Assertion error report
             ------------------------------------
             serializer(str): optional. Parameter for overriding self.serializer
+            lazy(bool): default False. If True, content is deserialized and wrapped on first access to LazyResponse
             **serializer_kwargs: optional arguments for serializer module
 
         Returns:
@@ -101,8 +413,117 @@ class Http(BaseTransport):
             params=params,
             data=data,
         )
+        if lazy:
+            return LazyResponse(response, lambda: wrapper(
+                Serializer.loads(target=response.content, serializer=serializer, **serializer_kwargs)
+            ))
         return wrapper(Serializer.loads(target=response.content, serializer=serializer, **serializer_kwargs))
 
+    def cached_request(self, method, url, data, headers, expected_status, wrapper, params, serializer, **kwargs):
+        """Sends request through self.cache. Used in "request" method for GET requests. Fresh cached content is
+        wrapped without request, stale content is revalidated. Parameters are prepared parameters of "request" method
+
+        Returns:
+            prepared response(usually Model instance)
+        """
+        cache = self.cache
+        wrapper = wrapper or self.model.wrap
+        merged_headers = merge_setting(headers, self.session.headers, dict_class=CaseInsensitiveDict)
+        merged_params = merge_setting(params, self.session.params)
+        key = cache.key(method, url, merged_params, merged_headers, serializer, data)
+        entry = cache.get(key)
+        if entry is not None and entry.fresh:
+            cache.count('hits')
+        else:
+            validators = entry.validators() if entry is not None else {}
+            _response = self.session.request(
+                method=method, url=url, data=data, headers=dict(headers, **validators), params=params, **kwargs
+            )
+            if validators and _response.status_code == 304:
+                cache.refresh(entry)
+            else:
+                cache.count('misses')
+
+                def store(payload):
+                    cache.put(key, _response, payload)
+                    return wrapper(payload)
+
+                return self.prepare_response(
+                    response=_response,
+                    method=method,
+                    url=url,
+                    expected_status=expected_status,
+                    wrapper=store,
+                    headers=merged_headers,
+                    params=merged_params,
+                    data=data,
+                    raw_response=False,
+                    serializer=serializer,
+                )
+        assert_response_status(
+            response=entry.response,
+            method=method,
+            url=url,
+            expected_status=expected_status,
+            headers=merged_headers,
+            params=merged_params,
+            data=data,
+        )
+        return wrapper(entry.payload())
+
+    def prepare_stream(self, response, method, url, expected_status, wrapper, headers, params, data,
+                       chunk_size=None):
+        """Asserts response status and returns generator, which parses JSON array from response body by parts.
+        Used in "request" method with stream=True. Parameters are the same as in prepare_response
+
+        Parameters:
+            chunk_size(int): optional. If set, generator yields ListObject of chunk_size elements, else wrapped
+                elements one by one
+
+        Returns:
+            generator
+        """
+        wrapper = wrapper or self.model.wrap
+        try:
+            assert_response_status(
+                response=response,
+                method=method,
+                url=url,
+                expected_status=expected_status,
+                headers=headers,
+                params=params,
+                data=data,
+            )
+        except AssertionError:
+            response.close()
+            raise
+        # requests.encoding falls back to ISO-8859-1 for text/* without charset, JSON is UTF-8 by default
+        elements = iter_json_array(response.iter_content(self.stream_read_size), self._charset(response) or 'utf-8')
+        if chunk_size:
+            return self._stream_chunks(response, elements, wrapper, chunk_size)
+        return self._stream(response, elements, wrapper)
+
+    @staticmethod
+    def _charset(response):
+        message = Message()
+        message['Content-Type'] = response.headers.get('Content-Type', '')
+        return message.get_content_charset()
+
+    @staticmethod
+    def _stream(response, elements, wrapper):
+        with response:
+            for element in elements:
+                yield wrapper(element)
+
+    @staticmethod
+    def _stream_chunks(response, elements, wrapper, chunk_size):
+        with response:
+            while True:
+                chunk = list(islice(elements, chunk_size))
+                if not chunk:
+                    return
+                yield ListObject(data=chunk, wrapper=wrapper)
+
     def get(self, **kwargs):
         """Http GET method
 
@@ -159,9 +580,40 @@ class Http(BaseTransport):
         """
         return self.request('DELETE', **kwargs)
 
+    def map(self, method, models, max_workers=10, **kwargs):
+        """Sends one request per model concurrently on thread pool. Url of every request is prepared with its model,
+        request body is taken from its model. All requests share the session and connection pool of transport(set
+        pool_kwargs={'pool_maxsize': max_workers} to keep all connections alive). Errors don't abort the batch
+
+        Parameters:
+            method(str): http method name
+            models(Iterable): ListObject of models, list of models or dicts
+            max_workers(int): default 10. Threads count
+            **kwargs: parameters for request method. By default responses are wrapped by self.model.wrap
+
+        Returns:
+            list of prepared responses in the order of models. Failed requests are represented by raised
+            exceptions(e.g. ResponseStatusAssertionError) at their positions
+
+        >>> users = User.http.map('GET', User.wrap([{'id': 1}, {'id': 2}]), max_workers=2, expected_status=200)
+        >>> errors = [i for i in users if isinstance(i, Exception)]
+        """
+        kwargs['wrapper'] = kwargs.get('wrapper') or self.model.wrap
+
+        def send(model):
+            transport = copy(self)
+            transport.model = model
+            try:
+                return transport.request(method, **kwargs)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(send, models))
+
     def request(self, method=None, url=None, data=None, headers=None,
                 expected_status=None, wrapper=None, raw_response=False,
-                params=None, serializer=None, host=None, **kwargs):
+                params=None, serializer=None, host=None, stream=False, chunk_size=None, lazy=None, **kwargs):
         """Main method for data transformation and transferring
 
         Parameters:
@@ -175,15 +627,41 @@ class Http(BaseTransport):
             raw_response(bool): default False. If True, method returns requests.Response object. In this case all transformations and checks will be ignored
             params(dict): optional. requsts.Session.get params parameter
             serializer(str): optional. Parameter for overriding self.serializer
+            stream(bool): default False. If True, response body should be JSON array. It is read and parsed by parts,
+                method returns generator of wrapped elements. Status is asserted before returning
+            chunk_size(int): optional. With stream=True generator yields ListObject chunks of chunk_size elements
+            lazy(bool): optional. Parameter for overriding self.lazy
             **kwargs: requests.Session.request method kwargs
 
         Returns:
             prepared response(usually Model instance)
+
+        >>> for user in User.http.get(stream=True, expected_status=200):
+        >>>     print(user.id)
         """
         serializer = serializer or self.serializer
         url = self.prepare_url(host, url)
         data, headers = self.prepare_request(data=data, headers=headers, serializer=serializer)
-        _response = self.session.request(method=method, url=url, data=data, headers=headers, params=params, **kwargs)
+        if self.cache is not None and not stream and not raw_response and method.upper() == 'GET':
+            return self.cached_request(
+                method=method, url=url, data=data, headers=headers, expected_status=expected_status,
+                wrapper=wrapper, params=params, serializer=serializer, **kwargs
+            )
+        _response = self.session.request(
+            method=method, url=url, data=data, headers=headers, params=params, stream=stream, **kwargs
+        )
+        if stream and not raw_response:
+            return self.prepare_stream(
+                response=_response,
+                method=method,
+                url=url,
+                expected_status=expected_status,
+                wrapper=wrapper,
+                headers=merge_setting(headers, self.session.headers, dict_class=CaseInsensitiveDict),
+                params=merge_setting(params, self.session.params),
+                data=data,
+                chunk_size=chunk_size,
+            )
         response = self.prepare_response(
             response=_response,
             method=method,
@@ -194,6 +672,7 @@ class Http(BaseTransport):
             params=merge_setting(params, self.session.params),
             data=data,
             raw_response=raw_response,
-            serializer=serializer
+            serializer=serializer,
+            lazy=self.lazy if lazy is None else lazy,
         )
         return response
@@ -0,0 +1,171 @@
+"""
+* Copyright 2020 Wargaming Group Limited
+*
+* Licensed under the Apache License, Version 2.0 (the "License");
+* you may not use this file except in compliance with the License.
+* You may obtain a copy of the License at
+*
+*     http://www.apache.org/licenses/LICENSE-2.0
+*
+* Unless required by applicable law or agreed to in writing, software
+* distributed under the License is distributed on an "AS IS" BASIS,
+* WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+* See the License for the specific language governing permissions and
+* limitations under the License.
+"""
+
+import asyncio
+from weakref import WeakKeyDictionary
+
+from aiohttp import ClientSession, TCPConnector
+
+from arsenalqa.base.transports import BaseTransport
+from arsenalqa.transports.http import Http
+
+
+async def gather(*aws, limit=100, return_exceptions=False):
+    """asyncio.gather with bounded concurrency: not more than "limit" awaitables are awaited at the same time
+
+    Parameters:
+        *aws: awaitables(usually AsyncHttp requests)
+        limit(int): default 100. Max count of concurrently awaited awaitables
+        return_exceptions(bool): default False. See asyncio.gather
+
+    Returns:
+        list of results in the order of awaitables
+
+    >>> users = await gather(*[User(id=i).http.get(expected_status=200) for i in range(5000)], limit=50)
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*[run(aw) for aw in aws], return_exceptions=return_exceptions)
+
+
+class AsyncResponse:
+    """
+    Read response of aiohttp with requests-like attributes, used by Http.prepare_response
+
+    Parameters:
+        response(aiohttp.ClientResponse): raw response
+        content(bytes): read response body
+    """
+
+    def __init__(self, response, content):
+        self.response = response
+        self.content = content
+        self.status_code = response.status
+        self.headers = response.headers
+        self.url = str(response.url)
+
+
+class AsyncHttp(Http):
+    """
+    Asynchronous version of Http transport on aiohttp. All http methods are coroutines with the same parameters and
+    response preparation(expected_status, wrapper, serializer, raw_response) as Http methods. Raw response is
+    AsyncResponse object.
+
+    Parameters:
+        host(str): optional first part of url
+        url(str): url with "format" like mask: "http://example.com/users/{id}/"
+        session(aiohttp.ClientSession): optional. By default one session per event loop and connection limits is shared
+            by all AsyncHttp transports
+        limit(int): default 100. Max count of simultaneous connections of shared session
+        limit_per_host(int): default 0(no limit). Max count of simultaneous connections to one host of shared session
+        model(Model): default FakeModel. Model which will be used in transport for send data and wrap response by default
+        serializer(str): default "json". Name of registered codec(json, orjson, ujson, msgpack) or of module which
+            should have two methods: dumps and loads. See Serializer
+        lazy(bool): default False. If True, requests return LazyResponse. See Http
+
+    >>> class User(Model):
+    >>>     http = TransportManager(AsyncHttp, url='http://example.com/users/{id}')
+    >>>
+    >>> user = await User(id=1).http.get(expected_status=200)
+    """
+
+    sessions = WeakKeyDictionary()
+
+    def __init__(self, session=None, limit=100, limit_per_host=0, lazy=False, **kwargs):
+        BaseTransport.__init__(self, session=session, **kwargs)
+        self.lazy = lazy
+        self.cache = None
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+
+    def get_session(self):
+        """Returns own session or session shared in current event loop"""
+        if self.session is not None:
+            return self.session
+        sessions = self.sessions.setdefault(asyncio.get_running_loop(), {})
+        key = (self.limit, self.limit_per_host)
+        session = sessions.get(key)
+        if session is None or session.closed:
+            session = sessions[key] = ClientSession(
+                connector=TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            )
+        return session
+
+    @classmethod
+    async def close_sessions(cls):
+        """Closes shared sessions of current event loop. Call it before loop closing"""
+        for session in cls.sessions.pop(asyncio.get_running_loop(), {}).values():
+            await session.close()
+
+    def pool_stats(self):
+        """Returns connection pool statistics of session connector. Should be called in running event loop
+
+        Returns:
+            dict: connections limits, acquired(in use) and idle(kept-alive) connections count
+        """
+        connector = self.get_session().connector
+        return {
+            'limit': connector.limit,
+            'limit_per_host': connector.limit_per_host,
+            'acquired': len(getattr(connector, '_acquired', ())),
+            'idle': sum(len(i) for i in getattr(connector, '_conns', {}).values()),
+        }
+
+    def map(self, method, models, max_workers=10, **kwargs):
+        """Not supported: use gather with AsyncHttp requests instead"""
+        raise Exception('AsyncHttp does not support map method, use gather instead')
+
+    def cached_request(self, *args, **kwargs):
+        raise Exception('AsyncHttp does not support response cache')
+
+    def prepare_stream(self, *args, **kwargs):
+        raise Exception('AsyncHttp does not support streaming responses')
+
+    async def request(self, method=None, url=None, data=None, headers=None,
+                      expected_status=None, wrapper=None, raw_response=False,
+                      params=None, serializer=None, host=None, lazy=None, **kwargs):
+        """Main method for data transformation and transferring. See Http.request
+
+        Parameters:
+            **kwargs: aiohttp.ClientSession.request method kwargs
+
+        Returns:
+            prepared response(usually Model instance)
+        """
+        serializer = serializer or self.serializer
+        url = self.prepare_url(host, url)
+        data, headers = self.prepare_request(data=data, headers=headers, serializer=serializer)
+        async with self.get_session().request(
+                method=method, url=url, data=data, headers=headers, params=params, **kwargs
+        ) as _response:
+            response = AsyncResponse(_response, await _response.read())
+        return self.prepare_response(
+            response=response,
+            method=method,
+            url=url,
+            expected_status=expected_status,
+            wrapper=wrapper,
+            headers=headers,
+            params=params,
+            data=data,
+            raw_response=raw_response,
+            serializer=serializer,
+            lazy=self.lazy if lazy is None else lazy,
+        )
@@ -40,9 +40,18 @@ class TransportManager:
         self.kwargs = kwargs
 
     def __get__(self, instance, owner):
+        if instance is not None:
+            transports = getattr(instance, '_transports', None)
+            if transports is not None and self.name in transports:
+                return transports[self.name]
         transport = self.transport(**self.kwargs)
         if instance is not None:
-            setattr(instance, self.name, transport)
+            if hasattr(instance, '__dict__'):
+                setattr(instance, self.name, transport)
+            else:
+                if transports is None:
+                    transports = instance._transports = {}
+                transports[self.name] = transport
             transport.model = instance
             return transport
         transport.model = owner
@@ -65,7 +65,8 @@ class WebSocket(AsyncWebsocket):
         session(websockets.client.connect): optional. Instance of websockets Client
         loop: loop for running websockets async Client
         model(Model): default FakeModel. Model which will be used in transport for send data and wrap response by default
-        serializer(str): default "json". Name of serializer module which should have two methods: dumps and loads
+        serializer(str): default "json". Name of registered codec(json, orjson, ujson, msgpack) or of module which
+            should have two methods: dumps and loads. See Serializer
     """
 
     loop = asyncio.get_event_loop()
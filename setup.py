@@ -23,6 +23,7 @@ setup(
             'arsenalqa.transports.amqp',
             'arsenalqa.transports.db',
             'arsenalqa.transports.websocket',
+            'arsenalqa.columnar',
         )
     ),
     extras_require={
@@ -30,6 +31,10 @@ setup(
         'amqp': f'arsenalqa-amqp>={VERSION}',
         'db': f'arsenalqa-db>={VERSION}',
         'websocket': f'arsenalqa-websocket>={VERSION}',
+        'columnar': f'arsenalqa-columnar>={VERSION}',
+        'orjson': 'orjson>=3.0',
+        'ujson': 'ujson>=4.0',
+        'msgpack': 'msgpack>=1.0',
     },
     zip_safe=False,
     install_requires=[
@@ -22,7 +22,7 @@ setup(
     ),
     zip_safe=False,
     install_requires=[
-        'sqlalchemy==1.3.17',
+        'sqlalchemy>=1.4,<2.0',
         'pypika==0.37.15',
     ],
     python_requires='>=3.7',
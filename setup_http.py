@@ -24,6 +24,9 @@ setup(
     install_requires=[
         'requests>=2.0,<3.0',
     ],
+    extras_require={
+        'async': 'aiohttp>=3.6,<4.0',
+    },
     python_requires='>=3.7',
     keywords=['TESTING', 'MICROSERVICES'],
     classifiers=[